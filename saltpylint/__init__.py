@@ -0,0 +1,45 @@
+"""
+saltpylint
+~~~~~~~~~~
+
+Loading ``saltpylint`` as a pylint plugin registers every saltpylint checker, there's
+no need to list each ``saltpylint.*`` module in ``load-plugins``:
+
+.. code-block:: ini
+
+    [MASTER]
+    load-plugins=saltpylint
+
+Don't list the individual ``saltpylint.*`` modules together with ``saltpylint``, their
+checkers would be registered twice.
+"""
+
+import importlib
+
+PLUGIN_MODULES = (
+    "saltpylint.blacklist",
+    "saltpylint.coroutines",
+    "saltpylint.dunder_del",
+    "saltpylint.fileperms",
+    "saltpylint.inference",
+    "saltpylint.loaderindex",
+    "saltpylint.pathscope",
+    "saltpylint.smartup",
+    "saltpylint.thirdparty",
+    "saltpylint.timebudget",
+    "saltpylint.virt",
+)
+
+
+def register(linter):
+    """Register all of the saltpylint checkers."""
+    for modname in PLUGIN_MODULES:
+        importlib.import_module(modname).register(linter)
+
+
+def load_configuration(linter):
+    """Call the configuration hook of the saltpylint plugin modules which define one."""
+    for modname in PLUGIN_MODULES:
+        module = importlib.import_module(modname)
+        if hasattr(module, "load_configuration"):
+            module.load_configuration(linter)
@@ -13,6 +13,14 @@ import astroid
 from pylint.checkers import BaseChecker
 from pylint.checkers import utils
 
+from saltpylint.inference import safe_infer
+from saltpylint.loaderindex import get_loader_index
+from saltpylint.utils import SALT_DUNDERS
+from saltpylint.utils import compile_globs
+from saltpylint.utils import get_call_target_name
+from saltpylint.utils import get_dotted_name
+from saltpylint.utils import get_inferred_full_name
+
 BLACKLISTED_IMPORTS_MSGS = {
     "E9402": (
         "Uses of a blacklisted module %r: %s",
@@ -54,6 +62,7 @@ class BlacklistedImportsChecker(BaseChecker):
     priority = -2
 
     def open(self):
+        self.skip_module = False
         self.blacklisted_modules = (
             "salttesting",
             "integration",
@@ -65,15 +74,17 @@ class BlacklistedImportsChecker(BaseChecker):
             "unittest2",
         )
 
-    def visit_import(self, node):
-        """Triggered when an import statement is seen."""
-        module_filename = node.root().file
-        if fnmatch.fnmatch(module_filename, "__init__.py*") and not fnmatch.fnmatch(
+    def visit_module(self, node):
+        module_filename = node.file or ""
+        self.skip_module = fnmatch.fnmatch(module_filename, "__init__.py*") and not fnmatch.fnmatch(
             module_filename,
             "test_*.py*",
-        ):
+        )
+
+    def visit_import(self, node):
+        """Triggered when an import statement is seen."""
+        if self.skip_module:
             return
-        node.root()
         names = [name for name, _ in node.names]
 
         for name in names:
@@ -81,11 +92,7 @@ class BlacklistedImportsChecker(BaseChecker):
 
     def visit_importfrom(self, node):
         """Triggered when a from statement is seen."""
-        module_filename = node.root().file
-        if fnmatch.fnmatch(module_filename, "__init__.py*") and not fnmatch.fnmatch(
-            module_filename,
-            "test_*.py*",
-        ):
+        if self.skip_module:
             return
         basename = node.modname
         self._check_blacklisted_module(node, basename)
@@ -315,28 +322,7 @@ class BlacklistedLoaderModulesUsageChecker(BaseChecker):
 
     def open(self):
         self.process_module = False
-        self.salt_dunders = (
-            "__opts__",
-            "__salt__",
-            "__runner__",
-            "__context__",
-            "__utils__",
-            "__ext_pillar__",
-            "__thorium__",
-            "__states__",
-            "__serializers__",
-            "__ret__",
-            "__grains__",
-            "__pillar__",
-            "__sdb__",
-            "__proxy__",
-            "__low__",
-            "__orchestration_jid__",
-            "__running__",
-            "__intance_id__",
-            "__lowstate__",
-            "__env__",
-        )
+        self.salt_dunders = SALT_DUNDERS
         self.imported_salt_modules = {}
 
     def close(self):
@@ -433,6 +419,350 @@ class BlacklistedLoaderModulesUsageChecker(BaseChecker):
         )
 
 
+UNKNOWN_LOADER_FUNCTION_MSGS = {
+    "E9510": (
+        "Unknown salt execution module function %r. Module %r does not provide it.",
+        "unknown-salt-function",
+        "A __salt__ string key does not resolve to any known execution module function.",
+    ),
+}
+
+
+class UnknownLoaderFunctionChecker(BaseChecker):
+    name = "unknown-salt-function"
+    msgs = UNKNOWN_LOADER_FUNCTION_MSGS
+    priority = -2
+
+    options = (
+        (
+            "salt-execution-modules-dirs",
+            {
+                "default": ("salt/modules",),
+                "type": "csv",
+                "metavar": "<comma-separated-list>",
+                "help": "Salt execution modules directories, relative to the current working "
+                "directory, separated by a comma",
+            },
+        ),
+        (
+            "salt-function-index-cache",
+            {
+                "default": "",
+                "type": "string",
+                "metavar": "<path>",
+                "help": "Path to the file where the salt execution modules function index is "
+                "cached across runs. Empty to disable caching",
+            },
+        ),
+    )
+
+    def open(self):
+        loader_index = get_loader_index(
+            os.getcwd(),
+            self.linter.config.salt_execution_modules_dirs,
+            cache_path=self.linter.config.salt_function_index_cache or None,
+        )
+        self.loader_names, self.loader_functions = loader_index.function_index()
+
+    def visit_subscript(self, node):
+        if not self.loader_functions:
+            # Not checking salt's source tree
+            return
+        if not isinstance(node.value, astroid.Name) or node.value.name != "__salt__":
+            return
+        if not isinstance(node.slice, astroid.Const) or not isinstance(node.slice.value, str):
+            return
+        target = node.slice.value
+        if target in self.loader_functions:
+            return
+        loader_name = target.split(".", 1)[0]
+        if loader_name not in self.loader_names:
+            # Could be provided by an extension, or by a custom module, leave it alone
+            return
+        self.add_message("unknown-salt-function", node=node, args=(target, loader_name))
+
+
+UNBOUNDED_CACHE_MSGS = {
+    "W9540": (
+        "Write to %r derived from the function arguments, which is never evicted nor size "
+        "bound. It grows unbounded in long running processes.",
+        "unbounded-cache-growth",
+        "Per call data is stored in __context__, or in a module level container, and never "
+        "evicted, which makes long running minions and masters grow in memory.",
+    ),
+}
+
+
+class UnboundedCacheChecker(BaseChecker):
+    name = "unbounded-cache-growth"
+    msgs = UNBOUNDED_CACHE_MSGS
+    priority = -2
+
+    # Container methods which store data, and which evict it or expose its size
+    grow_methods = ("add", "append", "appendleft", "extend", "insert", "setdefault", "update")
+    evict_methods = ("clear", "discard", "pop", "popitem", "popleft", "remove")
+    container_constructors = (
+        "collections.OrderedDict",
+        "collections.defaultdict",
+        "dict",
+        "list",
+        "set",
+    )
+
+    options = (
+        (
+            "cache-dunders",
+            {
+                "default": ("__context__",),
+                "type": "csv",
+                "metavar": "<dunders>",
+                "help": "Salt loader dunders which persist across calls, separated by a comma",
+            },
+        ),
+        (
+            "cache-helpers",
+            {
+                "default": (
+                    "cachetools.*",
+                    "collections.deque",
+                    "functools.lru_cache",
+                    "salt.utils.cache.*",
+                ),
+                "type": "csv",
+                "metavar": "<call-globs>",
+                "help": "Globs of the approved cache helpers, which bound their size or evict "
+                "entries, separated by a comma",
+            },
+        ),
+    )
+
+    def open(self):
+        self.cache_dunders = {
+            dunder for dunder in self.linter.config.cache_dunders if dunder in SALT_DUNDERS
+        }
+        self.cache_helpers = compile_globs(self.linter.config.cache_helpers)
+        self.tracked_containers = set()
+
+    def _is_cache_helper(self, node):
+        if self.cache_helpers is None:
+            return False
+        name = get_dotted_name(node)
+        return name is not None and self.cache_helpers.match(name) is not None
+
+    def visit_module(self, node):
+        """Collect the module level containers which are never evicted nor size bound."""
+        containers = set(self.cache_dunders)
+        for name, assignments in node.locals.items():
+            if name in SALT_DUNDERS:
+                # The loader dunders stubs injected by saltpylint.smartup, only the
+                # cache-dunders option decides which ones are tracked
+                continue
+            for assignment in assignments:
+                if not isinstance(assignment, astroid.AssignName):
+                    continue
+                value = getattr(assignment.parent, "value", None)
+                if isinstance(value, (astroid.Dict, astroid.List, astroid.Set)) or (
+                    isinstance(value, astroid.Call)
+                    and get_dotted_name(value.func) in self.container_constructors
+                ):
+                    containers.add(name)
+        for name in list(containers):
+            for assignment in node.locals.get(name, ()):
+                value = getattr(assignment.parent, "value", None)
+                if isinstance(value, astroid.Call) and self._is_cache_helper(value.func):
+                    containers.discard(name)
+        if containers:
+            for child in node.nodes_of_class((astroid.Delete, astroid.Call)):
+                if isinstance(child, astroid.Delete):
+                    for target in child.targets:
+                        if isinstance(target, astroid.Subscript) and isinstance(
+                            target.value,
+                            astroid.Name,
+                        ):
+                            containers.discard(target.value.name)
+                elif isinstance(child.func, astroid.Attribute):
+                    if child.func.attrname in self.evict_methods and isinstance(
+                        child.func.expr,
+                        astroid.Name,
+                    ):
+                        containers.discard(child.func.expr.name)
+                elif isinstance(child.func, astroid.Name) and child.func.name == "len":
+                    # Size bound checks
+                    for arg in child.args:
+                        if isinstance(arg, astroid.Name):
+                            containers.discard(arg.name)
+        self.tracked_containers = containers
+
+    def _get_function(self, node, container):
+        """Return the function the write happens in, if it must be checked."""
+        scope = node.scope()
+        if not isinstance(scope, astroid.FunctionDef) or container in scope.locals:
+            # Not in a function, or a local container
+            return None
+        if scope.decorators is not None:
+            for decorator in scope.decorators.nodes:
+                if isinstance(decorator, astroid.Call):
+                    decorator = decorator.func  # noqa: PLW2901
+                if self._is_cache_helper(decorator):
+                    return None
+        return scope
+
+    @staticmethod
+    def _references_arguments(nodes, function):
+        argnames = set(function.argnames())
+        for node in nodes:
+            if isinstance(node, astroid.Name) and node.name in argnames:
+                return True
+            for name in node.nodes_of_class(astroid.Name):
+                if name.name in argnames:
+                    return True
+        return False
+
+    def visit_assign(self, node):
+        if not self.tracked_containers:
+            return
+        for target in node.targets:
+            if not isinstance(target, astroid.Subscript) or not isinstance(
+                target.value,
+                astroid.Name,
+            ):
+                continue
+            container = target.value.name
+            if container not in self.tracked_containers:
+                continue
+            function = self._get_function(node, container)
+            if function is not None and self._references_arguments([target.slice], function):
+                self.add_message("unbounded-cache-growth", node=node, args=(container,))
+
+    def visit_call(self, node):
+        if not self.tracked_containers:
+            return
+        if (
+            not isinstance(node.func, astroid.Attribute)
+            or node.func.attrname not in self.grow_methods
+            or not isinstance(node.func.expr, astroid.Name)
+        ):
+            return
+        container = node.func.expr.name
+        if container not in self.tracked_containers:
+            return
+        function = self._get_function(node, container)
+        if function is None:
+            return
+        arguments = list(node.args) + [keyword.value for keyword in node.keywords or ()]
+        if node.func.attrname == "setdefault":
+            # Only the key matters
+            arguments = arguments[:1]
+        if self._references_arguments(arguments, function):
+            self.add_message("unbounded-cache-growth", node=node, args=(container,))
+
+
+CALL_IN_LOOP_MSGS = {
+    "W9530": (
+        "Call to %r inside a loop.%s",
+        "expensive-call-in-loop",
+        "An expensive call, like a salt loader dunder call, is made once per element inside "
+        "a loop or comprehension when a single batched call would do.",
+    ),
+}
+
+
+class CallInLoopChecker(BaseChecker):
+    name = "expensive-call-in-loop"
+    msgs = CALL_IN_LOOP_MSGS
+    priority = -2
+
+    options = (
+        (
+            "loop-expensive-calls",
+            {
+                "default": (
+                    "__salt__[*]",
+                    "salt.utils.files.fopen",
+                    "salt.utils.path.which",
+                    "subprocess.*",
+                ),
+                "type": "csv",
+                "metavar": "<call-globs>",
+                "help": "Globs of the call targets considered expensive inside loops, separated by "
+                "a comma. Salt loader dunder calls are written as __salt__[cmd.run]",
+            },
+        ),
+        (
+            "loop-batched-calls",
+            {
+                "default": (
+                    "__salt__[pkg.version]=__salt__[pkg.list_pkgs],"
+                    "__salt__[pkg.latest_version]=__salt__[pkg.latest_version] with all the names,"
+                    "__salt__[pkg.install]=__salt__[pkg.install] with the pkgs argument,"
+                    "__salt__[pkg.remove]=__salt__[pkg.remove] with the pkgs argument,"
+                    "__salt__[pkg.purge]=__salt__[pkg.purge] with the pkgs argument,"
+                    "__salt__[service.status]=__salt__[service.get_running],"
+                    "__salt__[grains.get]=__grains__"
+                ),
+                "type": "string",
+                "metavar": "call1=batched1,call2=batched2",
+                "help": "List of call targets and their batched alternatives",
+            },
+        ),
+    )
+
+    def open(self):
+        self.expensive_calls = compile_globs(self.linter.config.loop_expensive_calls)
+        self.batched_calls = {}
+        for item in self.linter.config.loop_batched_calls.split(","):
+            try:
+                key, val = (x.strip() for x in item.split("=", 1))
+            except ValueError:
+                pass
+            else:
+                self.batched_calls[key] = val
+
+    @staticmethod
+    def _get_enclosing_loop(node):
+        """Return the loop or comprehension which lexically repeats the passed node, if any.
+
+        Only the current function scope is considered, and the parts of loops which are
+        only evaluated once, like the iterable of a ``for`` loop, are not repeated.
+        """
+        child = node
+        for parent in node.node_ancestors():
+            if isinstance(parent, (astroid.FunctionDef, astroid.Lambda, astroid.ClassDef)):
+                return None
+            if isinstance(parent, astroid.For) and child in parent.body:
+                return parent
+            if isinstance(parent, astroid.While) and (child is parent.test or child in parent.body):
+                return parent
+            if isinstance(parent, astroid.Comprehension) and (
+                child in parent.ifs
+                or (child is parent.iter and parent is not parent.parent.generators[0])
+            ):
+                return parent.parent
+            if (
+                isinstance(parent, (astroid.ListComp, astroid.SetComp, astroid.GeneratorExp))
+                and child is parent.elt
+            ):
+                return parent
+            if isinstance(parent, astroid.DictComp) and child in (parent.key, parent.value):
+                return parent
+            child = parent
+        return None
+
+    def visit_call(self, node):
+        if self.expensive_calls is None:
+            return
+        target = get_call_target_name(node)
+        if target is None or not self.expensive_calls.match(target):
+            return
+        if self._get_enclosing_loop(node) is None:
+            return
+        try:
+            suggestion = f" Consider a single batched call instead: {self.batched_calls[target]}"
+        except KeyError:
+            suggestion = ""
+        self.add_message("expensive-call-in-loop", node=node, args=(target, suggestion))
+
+
 RESOURCE_LEAKAGE_MSGS = {
     "W8470": ("Resource leakage detected. %s ", "resource-leakage", "Resource leakage detected."),
 }
@@ -443,21 +773,151 @@ class ResourceLeakageChecker(BaseChecker):
     msgs = RESOURCE_LEAKAGE_MSGS
     priority = -2
 
+    options = (
+        (
+            "resource-constructors",
+            {
+                "default": (
+                    "socket.create_connection",
+                    "socket.socket",
+                    "subprocess.Popen",
+                    "tempfile.NamedTemporaryFile",
+                    "tempfile.SpooledTemporaryFile",
+                    "tempfile.TemporaryFile",
+                    "zmq.*Context",
+                    "zmq.*Context.instance",
+                    "zmq.*Context.socket",
+                ),
+                "type": "csv",
+                "metavar": "<call-globs>",
+                "help": "Globs of the calls which construct resources which must be used as a "
+                "context manager or closed in a 'finally' block, separated by a comma",
+            },
+        ),
+        (
+            "resource-close-methods",
+            {
+                "default": ("close", "communicate", "kill", "term", "terminate", "wait"),
+                "type": "csv",
+                "metavar": "<method-names>",
+                "help": "Names of the methods which release a resource, separated by a comma",
+            },
+        ),
+    )
+
     def open(self):
-        self.inside_with_ctx = False
+        self.with_stack = []
+        self.resource_constructors = compile_globs(self.linter.config.resource_constructors)
+        # Method calls are only inferred when their name could match a resource constructor
+        self.resource_constructor_methods = {
+            glob.rsplit(".", 1)[-1] for glob in self.linter.config.resource_constructors
+        }
+        self.resource_close_methods = set(self.linter.config.resource_close_methods)
 
     def close(self):
-        self.inside_with_ctx = False
+        self.with_stack = []
 
     def visit_with(self, node):
-        self.inside_with_ctx = True
+        self.with_stack.append(node)
 
     def leave_with(self, node):
-        self.inside_with_ctx = False
+        self.with_stack.pop()
+
+    def _get_resource_constructor_name(self, node):
+        """Return the name of the resource constructor the passed call calls, if any."""
+        if self.resource_constructors is None:
+            return None
+        target = get_call_target_name(node)
+        if target is not None and self.resource_constructors.match(target):
+            return target
+        if (
+            isinstance(node.func, astroid.Attribute)
+            and node.func.attrname in self.resource_constructor_methods
+        ):
+            # Method calls, like ``context.socket()``, need inference to be named
+            func = safe_infer(node.func)
+            try:
+                target = func.qname()
+            except AttributeError:
+                return None
+            if self.resource_constructors.match(target):
+                return target
+        return None
+
+    def _is_context_manager_expr(self, node):
+        """Return ``True`` if the node is, or is part of, the context expression of a ``with``."""
+        if not self.with_stack:
+            return False
+        child = node
+        for parent in node.node_ancestors():
+            if isinstance(parent, astroid.With):
+                return any(child is expr for expr, _ in parent.items)
+            if isinstance(parent, (astroid.FunctionDef, astroid.Lambda, astroid.ClassDef)):
+                return False
+            child = parent
+        return False
+
+    def _is_released_in_scope(self, name, scope):
+        """Return ``True`` if the named resource is used as a context manager, returned or
+        released in a ``finally`` block within the passed scope.
+        """
+        for child in scope.nodes_of_class(
+            (astroid.With, astroid.Try, astroid.Return),
+            skip_klass=(astroid.FunctionDef, astroid.ClassDef, astroid.Lambda),
+        ):
+            if isinstance(child, astroid.Return):
+                if isinstance(child.value, astroid.Name) and child.value.name == name:
+                    return True
+            elif isinstance(child, astroid.With):
+                for expr, _ in child.items:
+                    for name_node in expr.nodes_of_class(astroid.Name):
+                        if name_node.name == name:
+                            return True
+            else:
+                for stmt in child.finalbody:
+                    for call in stmt.nodes_of_class(astroid.Call):
+                        if (
+                            isinstance(call.func, astroid.Attribute)
+                            and call.func.attrname in self.resource_close_methods
+                            and isinstance(call.func.expr, astroid.Name)
+                            and call.func.expr.name == name
+                        ):
+                            return True
+        return False
+
+    def _check_resource_construction(self, node):
+        target = self._get_resource_constructor_name(node)
+        if target is None or self._is_context_manager_expr(node):
+            return
+        parent = node.parent
+        if isinstance(parent, (astroid.Return, astroid.Yield, astroid.Call, astroid.Keyword)):
+            # The ownership of the resource is passed on
+            return
+        if (
+            isinstance(parent, astroid.Attribute)
+            and parent.attrname in self.resource_close_methods
+            and isinstance(parent.parent, astroid.Call)
+            and parent.parent.func is parent
+        ):
+            # Released right away, like ``subprocess.Popen(...).communicate()``
+            return
+        if isinstance(parent, astroid.Assign):
+            names = [name.name for name in parent.targets if isinstance(name, astroid.AssignName)]
+            if len(names) != len(parent.targets):
+                # Stored in an attribute, or a container, and managed elsewhere
+                return
+            scope = node.scope()
+            if any(self._is_released_in_scope(name, scope) for name in names):
+                return
+        msg = (
+            f"Please use '{target}' as a context manager, using 'with', or release it "
+            "in a 'finally' block, otherwise resource leakage will occur."
+        )
+        self.add_message("resource-leakage", node=node, args=(msg,))
 
     def visit_call(self, node):
         if isinstance(node.func, astroid.Attribute):
-            if node.func.attrname == "fopen" and self.inside_with_ctx is False:
+            if node.func.attrname == "fopen" and not self._is_context_manager_expr(node):
                 msg = (
                     "Please call 'salt.utils.files.fopen' using the 'with' context "
                     "manager, otherwise the file handle won't be closed and "
@@ -469,7 +929,7 @@ class ResourceLeakageChecker(BaseChecker):
             and utils.is_builtin(node.func.name)
             and node.func.name == "open"
         ):
-            if self.inside_with_ctx:
+            if self._is_context_manager_expr(node):
                 msg = (
                     "Please use 'with salt.utils.files.fopen()' instead of "
                     "'with open()'. It assures salt does not leak "
@@ -482,6 +942,150 @@ class ResourceLeakageChecker(BaseChecker):
                     "handle won't be closed and resource leakage will occur."
                 )
             self.add_message("resource-leakage", node=node, args=(msg,))
+            return
+        self._check_resource_construction(node)
+
+
+WHOLE_FILE_READ_MSGS = {
+    "W9550": (
+        "Whole file read with '%s' only to iterate over its lines. Iterate over the file handle "
+        "instead.",
+        "whole-file-read",
+        "Reading a whole file, like a log, a package list or a cache file, only to iterate "
+        "over its lines loads it all in memory at once. Iterating over the file handle reads "
+        "it line by line.",
+    ),
+}
+
+
+class WholeFileReadChecker(BaseChecker):
+    name = "whole-file-read"
+    msgs = WHOLE_FILE_READ_MSGS
+    priority = -2
+
+    options = (
+        (
+            "whole-file-read-allow-list",
+            {
+                "default": ("/proc/*", "/sys/*", "/etc/hostname", "/etc/machine-id"),
+                "type": "csv",
+                "metavar": "<path-or-function-globs>",
+                "help": "Globs of the file paths, when passed as literals, or of the qualified "
+                "names of the functions, known to only read small files, separated by a comma",
+            },
+        ),
+    )
+
+    def open(self):
+        self.allow_list = compile_globs(self.linter.config.whole_file_read_allow_list)
+
+    @staticmethod
+    def _is_file_open_call(node):
+        """Return ``True`` if the node is a ``salt.utils.files.fopen`` or ``open`` call."""
+        if not isinstance(node, astroid.Call):
+            return False
+        if isinstance(node.func, astroid.Attribute):
+            return node.func.attrname == "fopen"
+        if isinstance(node.func, astroid.Name):
+            return node.func.name == "fopen" or (
+                node.func.name == "open" and utils.is_builtin(node.func.name)
+            )
+        return False
+
+    def _get_open_call(self, node):
+        """Return the call which opened the file handle the passed node refers to, if any."""
+        if self._is_file_open_call(node):
+            return node
+        if not isinstance(node, astroid.Name):
+            return None
+        _, assignments = node.lookup(node.name)
+        for assignment in assignments:
+            if not isinstance(assignment.parent, astroid.With):
+                continue
+            for expr, var in assignment.parent.items:
+                if var is assignment and self._is_file_open_call(expr):
+                    return expr
+        return None
+
+    @staticmethod
+    def _get_split_lines_call(node):
+        r"""Return the ``.splitlines()`` or ``.split("\n")`` call made on the passed node."""
+        parent = node.parent
+        if not isinstance(parent, astroid.Attribute) or not isinstance(parent.parent, astroid.Call):
+            return None
+        call = parent.parent
+        if call.func is not parent or call.keywords:
+            return None
+        if parent.attrname == "splitlines":
+            return call
+        if (
+            parent.attrname == "split"
+            and len(call.args) == 1
+            and isinstance(call.args[0], astroid.Const)
+            and call.args[0].value == "\n"
+        ):
+            return call
+        return None
+
+    @staticmethod
+    def _is_iter(node):
+        parent = node.parent
+        return isinstance(parent, (astroid.For, astroid.Comprehension)) and node is parent.iter
+
+    def _is_only_iterated(self, node):
+        """Return ``True`` if the value of the passed expression is only iterated over."""
+        if self._is_iter(node):
+            return True
+        parent = node.parent
+        if (
+            not isinstance(parent, astroid.Assign)
+            or len(parent.targets) != 1
+            or not isinstance(parent.targets[0], astroid.AssignName)
+        ):
+            return False
+        name = parent.targets[0].name
+        uses = [
+            name_node
+            for name_node in node.scope().nodes_of_class(astroid.Name)
+            if name_node.name == name
+        ]
+        return bool(uses) and all(self._is_iter(name_node) for name_node in uses)
+
+    def _is_allowed(self, node, open_call):
+        if self.allow_list is None:
+            return False
+        if self.allow_list.match(node.frame().qname()):
+            return True
+        if open_call.args:
+            path = open_call.args[0]
+            if isinstance(path, astroid.Const) and isinstance(path.value, str):
+                return self.allow_list.match(path.value) is not None
+        return False
+
+    def visit_call(self, node):
+        func = node.func
+        if (
+            not isinstance(func, astroid.Attribute)
+            or func.attrname not in ("read", "readlines")
+            or node.args
+            or node.keywords
+        ):
+            # Reads with a size hint are already bounded
+            return
+        open_call = self._get_open_call(func.expr)
+        if open_call is None:
+            return
+        if func.attrname == "readlines":
+            lines = node
+            read_expr = "readlines()"
+        else:
+            lines = self._get_split_lines_call(node)
+            if lines is None:
+                return
+            read_expr = f"read().{lines.func.attrname}()"
+        if not self._is_only_iterated(lines) or self._is_allowed(node, open_call):
+            return
+        self.add_message("whole-file-read", node=node, args=(read_expr,))
 
 
 MOVED_TEST_CASE_CLASSES_MSGS = {
@@ -600,30 +1204,7 @@ class BlacklistedFunctionsChecker(BaseChecker):
                 self.blacklisted_functions[key] = val
 
     def _get_full_name(self, node):
-        try:
-            func = utils.safe_infer(node.func)
-            if func.name.__str__() == "Uninferable":
-                return None
-        except Exception:
-            func = None
-        if func is None:
-            return None
-        ret = []
-        depth = 0
-        while func is not None:
-            depth += 1
-            if depth > self.max_depth:
-                # Prevent endless loop
-                return None
-            try:
-                ret.append(func.name)
-            except AttributeError:
-                return None
-            func = func.parent
-        # ret will contain the levels of the function from last to first (e.g.
-        # ['walk', 'os']. Reverse it and join with dots to get the correct
-        # full name for the function.
-        return ".".join(ret[::-1])
+        return get_inferred_full_name(node, max_depth=self.max_depth)
 
     def visit_call(self, node):
         if self.blacklisted_functions:
@@ -644,3 +1225,7 @@ def register(linter):
     linter.register_checker(MovedTestCaseClassChecker(linter))
     linter.register_checker(BlacklistedLoaderModulesUsageChecker(linter))
     linter.register_checker(BlacklistedFunctionsChecker(linter))
+    linter.register_checker(UnknownLoaderFunctionChecker(linter))
+    linter.register_checker(CallInLoopChecker(linter))
+    linter.register_checker(UnboundedCacheChecker(linter))
+    linter.register_checker(WholeFileReadChecker(linter))
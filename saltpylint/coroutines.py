@@ -0,0 +1,158 @@
+"""
+saltpylint.coroutines
+~~~~~~~~~~~~~~~~~~~~~
+
+Checks for blocking calls inside coroutines and IOLoop callbacks.
+
+Salt's master and minion run tornado and asyncio event loops, a single blocking call in
+a coroutine, or in a callback scheduled on the loop, stalls every connection on it.
+"""
+
+from typing import ClassVar
+
+import astroid
+from pylint.checkers import BaseChecker
+
+from saltpylint.utils import compile_globs
+from saltpylint.utils import get_call_target_name
+from saltpylint.utils import get_dotted_name
+from saltpylint.utils import get_inferred_full_name
+
+BLOCKING_CALL_MSG = "blocking-call-in-coroutine"
+
+# IOLoop and asyncio loop methods which schedule callbacks, and the index of the callback argument
+IOLOOP_CALLBACK_METHODS = {
+    "add_callback": 0,
+    "spawn_callback": 0,
+    "add_future": 1,
+    "add_timeout": 1,
+    "call_later": 1,
+    "call_at": 1,
+    "call_soon": 0,
+    "call_soon_threadsafe": 0,
+    "run_sync": 0,
+}
+
+
+class BlockingCallsChecker(BaseChecker):
+    """Checks for blocking calls inside coroutines and IOLoop callbacks."""
+
+    name = "blocking-calls"
+    priority = -2
+
+    msgs: ClassVar = {
+        "W9910": (
+            "Blocking call to %r inside %s %r. It stalls every connection on the event loop.",
+            BLOCKING_CALL_MSG,
+            "A blocking call inside a coroutine or an IOLoop callback stalls the event loop.",
+        ),
+    }
+
+    options = (
+        (
+            "blocking-calls",
+            {
+                "default": (
+                    "__salt__[cmd.*]",
+                    "builtins.open",
+                    "open",
+                    "os.popen",
+                    "os.system",
+                    "requests.*",
+                    "salt.utils.files.fopen",
+                    "salt.utils.http.query",
+                    "socket.create_connection",
+                    "subprocess.*",
+                    "time.sleep",
+                    "urllib.request.urlopen",
+                ),
+                "type": "csv",
+                "metavar": "<call-globs>",
+                "help": "Globs of the calls which block the event loop, separated by a comma. "
+                "Salt loader dunder calls are written as __salt__[cmd.run]",
+            },
+        ),
+        (
+            "coroutine-decorators",
+            {
+                "default": (
+                    "*gen.coroutine",
+                    "*gen.engine",
+                    "asyncio.coroutine",
+                    "types.coroutine",
+                ),
+                "type": "csv",
+                "metavar": "<decorator-globs>",
+                "help": "Globs of the decorators which turn functions into coroutines, "
+                "separated by a comma",
+            },
+        ),
+    )
+
+    def open(self):
+        super().open()
+        self.blocking_calls = compile_globs(self.linter.config.blocking_calls)
+        self.coroutine_decorators = compile_globs(self.linter.config.coroutine_decorators)
+        self.ioloop_callbacks = set()
+
+    def visit_module(self, node):
+        """Collect the names of the functions scheduled as IOLoop callbacks."""
+        self.ioloop_callbacks = set()
+        for call in node.nodes_of_class(astroid.Call):
+            if not isinstance(call.func, astroid.Attribute):
+                continue
+            try:
+                callback = call.args[IOLOOP_CALLBACK_METHODS[call.func.attrname]]
+            except (KeyError, IndexError):
+                continue
+            if isinstance(callback, astroid.Name):
+                self.ioloop_callbacks.add(callback.name)
+            elif isinstance(callback, astroid.Attribute):
+                self.ioloop_callbacks.add(callback.attrname)
+
+    def _get_coroutine_kind(self, node):
+        if isinstance(node, astroid.AsyncFunctionDef):
+            return "coroutine"
+        if node.decorators is not None and self.coroutine_decorators is not None:
+            for decorator in node.decorators.nodes:
+                if isinstance(decorator, astroid.Call):
+                    decorator = decorator.func  # noqa: PLW2901
+                name = get_dotted_name(decorator)
+                if name is not None and self.coroutine_decorators.match(name):
+                    return "coroutine"
+        if node.name in self.ioloop_callbacks:
+            return "IOLoop callback"
+        return None
+
+    def _get_blocking_call_name(self, node):
+        target = get_call_target_name(node)
+        if target is not None and self.blocking_calls.match(target):
+            return target
+        if target is not None and target.startswith("__"):
+            # Salt loader dunder call, there's nothing to infer
+            return None
+        full_name = get_inferred_full_name(node)
+        if full_name is not None and self.blocking_calls.match(full_name):
+            return full_name
+        return None
+
+    def visit_functiondef(self, node):
+        if self.blocking_calls is None:
+            return
+        kind = self._get_coroutine_kind(node)
+        if kind is None:
+            return
+        for call in node.nodes_of_class(
+            astroid.Call,
+            skip_klass=(astroid.FunctionDef, astroid.ClassDef, astroid.Lambda),
+        ):
+            target = self._get_blocking_call_name(call)
+            if target is not None:
+                self.add_message(BLOCKING_CALL_MSG, node=call, args=(target, kind, node.name))
+
+    visit_asyncfunctiondef = visit_functiondef
+
+
+def register(linter):
+    """Required method to auto register this checker."""
+    linter.register_checker(BlockingCallsChecker(linter))
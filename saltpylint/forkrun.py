@@ -0,0 +1,335 @@
+"""
+saltpylint.forkrun
+~~~~~~~~~~~~~~~~~~
+
+Runs pylint over a pre-warmed pool of forked workers.
+
+With ``jobs=N`` every pylint worker loads the plugins and the configuration, builds the
+``ThirdPartyImportsChecker`` module tables and parses the same standard library and
+3rd-party modules into astroid on its own. This run mode does that warm-up once, in
+the parent process, and then forks the workers, which share those pages copy-on-write.
+The modules are only pre-built once the linter is configured, so the plugin transforms
+and the ``init-hook`` of the configuration apply to them like in a stock run.
+The files to lint are distributed over the workers using the LPT partitioning from
+``saltpylint.shard``::
+
+    python -m saltpylint.forkrun --jobs 4 salt tests -- --rcfile=.pylintrc
+
+The pylint options go after ``--``. The wall time and memory usage of the run are
+reported on ``stderr`` and, with ``--compare``, compared with a stock ``pylint --jobs=N`` run.
+With ``--record-timings`` the per-file lint times are merged into a timings file, which
+``--timings`` and ``saltpylint.shard`` use to balance the next runs.
+Forking is only available on POSIX platforms.
+"""
+
+import argparse
+import ast
+import collections
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+import astroid
+from pylint.lint import Run
+
+from saltpylint.loaderindex import DEFAULT_LOADER_DIRS
+from saltpylint.loaderindex import get_loader_index
+from saltpylint.shard import TimingPyLinter
+from saltpylint.shard import iter_python_files
+from saltpylint.shard import load_timings
+from saltpylint.shard import merge_reports
+from saltpylint.shard import partition
+from saltpylint.shard import predict_costs
+from saltpylint.shard import save_timings
+from saltpylint.smartup import get_salt_loader_dunders_stub
+from saltpylint.thirdparty import ThirdPartyImportsChecker
+
+log = logging.getLogger(__name__)
+
+
+def get_most_imported_modules(filenames, count):
+    """Return the ``count`` modules most imported by the passed files."""
+    counter = collections.Counter()
+    for filename in filenames:
+        try:
+            with open(filename, "rb") as rfh:
+                tree = ast.parse(rfh.read(), filename=filename)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                counter.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                counter[node.module] += 1
+    return [modname for modname, _ in counter.most_common(count)]
+
+
+class ForkRunPyLinter(TimingPyLinter):
+    """A linter which, in the parent process, only loads the plugins and the configuration.
+
+    The checks run in the forked workers, once ``configure_only`` is cleared.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.configure_only = True
+
+    def check(self, files_or_modules):
+        if self.configure_only:
+            return
+        super().check(files_or_modules)
+
+    def generate_reports(self, verbose=False):  # noqa: FBT002
+        if self.configure_only:
+            return None
+        return super().generate_reports(verbose=verbose)
+
+
+class ForkRun(Run):
+    """Configures a ``ForkRunPyLinter`` the same way ``pylint`` would, without checking."""
+
+    LinterClass = ForkRunPyLinter
+
+
+def configure_linter(filenames, pylint_args):
+    """Return the linter configured from the passed pylint options."""
+    # The JSON output format comes last so it overrides the one of the passed options,
+    # the worker reports are merged by the parent
+    run = ForkRun([*pylint_args, "--jobs=1", "--output-format=json", *filenames], exit=False)
+    return run.linter
+
+
+def warm_up(linter, filenames, warm_modules):
+    """Do, once, the work every pylint worker would otherwise repeat.
+
+    Returns the number of modules pre-built into astroid.
+    """
+    ThirdPartyImportsChecker.get_known_std_modules()
+    get_salt_loader_dunders_stub()
+    if hasattr(linter.config, "salt_loader_dirs"):
+        get_loader_index(
+            os.getcwd(),
+            linter.config.salt_loader_dirs,
+            cache_path=linter.config.salt_loader_index_cache or None,
+        )
+    else:
+        get_loader_index(os.getcwd(), DEFAULT_LOADER_DIRS)
+    built = 0
+    for modname in get_most_imported_modules(filenames, warm_modules):
+        try:
+            astroid.MANAGER.ast_from_module_name(modname)
+        except astroid.AstroidError:
+            log.debug("Failed to pre-build module %r", modname, exc_info=True)
+            continue
+        built += 1
+    return built
+
+
+def get_pss_kb():
+    """Return the proportional set size of the current process in KiB, if available."""
+    try:
+        with open("/proc/self/smaps_rollup", encoding="utf-8") as rfh:
+            for line in rfh:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def get_exit_code(linter, score_value):
+    """Return the exit code ``pylint`` would exit with."""
+    if linter.config.exit_zero:
+        return 0
+    if linter.any_fail_on_issues():
+        return linter.msg_status or 1
+    if score_value is not None and score_value < linter.config.fail_under:
+        return linter.msg_status or 1
+    return linter.msg_status
+
+
+def run_worker(linter, index, filenames, output_dir):
+    """Lint the passed files in the forked worker and never return."""
+    code = 32
+    try:
+        linter.configure_only = False
+        with open(os.path.join(output_dir, f"worker-{index}.json"), "w", encoding="utf-8") as wfh:
+            linter.reporter.out = wfh
+            linter.check(filenames)
+            code = get_exit_code(linter, linter.generate_reports())
+        save_timings(os.path.join(output_dir, f"worker-{index}.timings.json"), linter.timings)
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else 1
+    except Exception:  # noqa: BLE001  pylint: disable=broad-except
+        # Report the crash, the worker exits with the fatal status below
+        traceback.print_exc()
+    finally:
+        stats = {
+            "files": len(filenames),
+            "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "pss_kb": get_pss_kb(),
+        }
+        with open(
+            os.path.join(output_dir, f"worker-{index}.stats.json"), "w", encoding="utf-8"
+        ) as wfh:
+            json.dump(stats, wfh)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)  # pylint: disable=protected-access
+
+
+def run_stock(jobs, filenames, pylint_args):
+    """Run stock ``pylint --jobs=N`` and return its wall time and peak RSS in KiB."""
+    start = time.perf_counter()
+    cmd = [sys.executable, "-m", "pylint", f"--jobs={jobs}", *pylint_args, *filenames]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)  # noqa: S603
+    # Unlike RUSAGE_CHILDREN, wait4 doesn't account the already reaped forked workers
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return time.perf_counter() - start, rusage.ru_maxrss
+
+
+def format_message(msg):
+    return (
+        f"{msg['path']}:{msg['line']}:{msg['column']}: {msg['message-id']}: "
+        f"{msg['message']} ({msg['symbol']})"
+    )
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    pylint_args = []
+    if "--" in argv:
+        idx = argv.index("--")
+        argv, pylint_args = argv[:idx], argv[idx + 1 :]
+
+    parser = argparse.ArgumentParser(
+        prog="python -m saltpylint.forkrun",
+        description="Run pylint over a pre-warmed pool of forked workers. "
+        "Pass the pylint options after '--'.",
+    )
+    parser.add_argument("paths", nargs="+", help="Files and directories to lint")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Number of workers")
+    parser.add_argument(
+        "--warm-modules",
+        type=int,
+        default=50,
+        help="Number of the most imported modules to pre-build into astroid in the parent",
+    )
+    parser.add_argument("--timings", default=None, help="Historical per-file timings JSON")
+    parser.add_argument(
+        "--record-timings",
+        default=None,
+        metavar="TIMINGS",
+        help="Merge the per-file lint times of this run into this timings JSON",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        default=False,
+        help="Also run stock 'pylint --jobs=N' and report its time and peak RSS",
+    )
+    options = parser.parse_args(argv)
+    if not hasattr(os, "fork"):
+        parser.error("Forking is not available on this platform")
+    if options.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    filenames = sorted(set(iter_python_files(options.paths)))
+    start = time.perf_counter()
+    linter = configure_linter(filenames, pylint_args)
+    warmed = warm_up(linter, filenames, options.warm_modules)
+    warm_up_time = time.perf_counter() - start
+
+    shards = [
+        shard_filenames
+        for _, shard_filenames in partition(
+            predict_costs(filenames, load_timings(options.timings)),
+            options.jobs,
+        )
+        if shard_filenames
+    ]
+    with tempfile.TemporaryDirectory(prefix="saltpylint-forkrun-") as output_dir:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pids = {}
+        for index, shard_filenames in enumerate(shards):
+            pid = os.fork()
+            if pid == 0:
+                run_worker(linter, index, shard_filenames, output_dir)
+            pids[pid] = index
+        exitcode = 0
+        while pids:
+            pid, status = os.wait()
+            pids.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            # Negative exit codes are workers killed by a signal
+            exitcode |= code if code >= 0 else 32
+        lint_time = time.perf_counter() - start - warm_up_time
+
+        # Workers which exited before linting, e.g. on a usage error, leave no report
+        messages = merge_reports(
+            report_path
+            for report_path in (
+                os.path.join(output_dir, f"worker-{index}.json") for index in range(len(shards))
+            )
+            if os.path.isfile(report_path) and os.path.getsize(report_path)
+        )
+        stats = []
+        for index in range(len(shards)):
+            try:
+                with open(
+                    os.path.join(output_dir, f"worker-{index}.stats.json"), encoding="utf-8"
+                ) as rfh:
+                    stats.append(json.load(rfh))
+            except (OSError, ValueError):
+                stats.append({"files": len(shards[index]), "maxrss_kb": None, "pss_kb": None})
+        if options.record_timings:
+            timings = {}
+            for index in range(len(shards)):
+                timings.update(
+                    load_timings(os.path.join(output_dir, f"worker-{index}.timings.json"))
+                )
+            save_timings(options.record_timings, timings)
+
+    for msg in messages:
+        print(format_message(msg))  # noqa: T201
+
+    total_time = warm_up_time + lint_time
+    report = [
+        f"saltpylint forkrun: {len(filenames)} files, {len(shards)} workers, "
+        f"{warmed} modules pre-built",
+        f"  warm-up {warm_up_time:.2f}s, lint {lint_time:.2f}s, total {total_time:.2f}s",
+    ]
+    for index, worker_stats in enumerate(stats):
+        maxrss = worker_stats["maxrss_kb"]
+        pss = worker_stats["pss_kb"]
+        report.append(
+            f"  worker {index}: {worker_stats['files']} files, "
+            f"peak RSS {maxrss / 1024 if maxrss else 0:.1f}MiB, "
+            f"PSS {pss / 1024 if pss else 0:.1f}MiB",
+        )
+    pss_total = sum(worker_stats["pss_kb"] or 0 for worker_stats in stats)
+    if pss_total:
+        report.append(f"  total workers PSS {pss_total / 1024:.1f}MiB")
+    if options.compare:
+        stock_time, stock_maxrss = run_stock(options.jobs, filenames, pylint_args)
+        fork_maxrss = max(worker_stats["maxrss_kb"] or 0 for worker_stats in stats) if stats else 0
+        report.append(
+            f"  stock pylint --jobs={options.jobs}: total {stock_time:.2f}s, "
+            f"largest process peak RSS {stock_maxrss / 1024:.1f}MiB "
+            f"(forkrun: {total_time:.2f}s, {fork_maxrss / 1024:.1f}MiB)",
+        )
+    print("\n".join(report), file=sys.stderr)  # noqa: T201
+    return exitcode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+saltpylint.inference
+~~~~~~~~~~~~~~~~~~~~
+
+Shared inference wrapper used by the inference heavy saltpylint checkers.
+
+It counts the inference calls, the cache hits and the time spent inferring, per
+module, and enforces a per node budget on the number of inferred values, giving up,
+with a debug level log message, when exceeded.
+
+The time spent is only checked between the values astroid yields, so the optional time
+budget stops inferences yielding many slow values, but it can't interrupt an inference
+which is slow to produce its first, or only, value. astroid's own limit on the number of
+nodes inferred per inference bounds those.
+
+Load ``saltpylint.inference`` as a plugin to configure the budget and to get the
+``Inference statistics`` report, with ``--reports=y``, listing the modules where most
+inference happens.
+"""
+
+import logging
+import time
+from typing import ClassVar
+
+import astroid
+from astroid import util
+from pylint.checkers import BaseChecker
+from pylint.exceptions import EmptyReportError
+from pylint.reporters.ureports.nodes import Table
+
+log = logging.getLogger(__name__)
+
+
+class InferenceStats:
+    """Inference counters for a single module."""
+
+    __slots__ = ("budget_exceeded", "cache_hits", "calls", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.budget_exceeded = 0
+        self.seconds = 0.0
+
+
+class InferenceTracker:
+    """Budgeted and accounted ``node.infer()``."""
+
+    def __init__(self, max_inferred_values=100, max_seconds=5.0):
+        self.max_inferred_values = max_inferred_values
+        self.max_seconds = max_seconds
+        self.stats = {}
+        self._cache = {}
+        self._cache_module = None
+
+    def reset(self):
+        self.stats = {}
+        self._cache = {}
+        self._cache_module = None
+
+    def infer(self, node):
+        """Return a tuple with the values inferred for the passed node.
+
+        Inference errors are swallowed and the values inferred so far returned. If the
+        node exceeds its budget, an empty tuple is returned.
+        """
+        module = node.root()
+        if module is not self._cache_module:
+            # Only keep cached results for the module being checked
+            self._cache_module = module
+            self._cache = {}
+        stats = self.stats.get(module.name)
+        if stats is None:
+            stats = self.stats[module.name] = InferenceStats()
+        stats.calls += 1
+        try:
+            result = self._cache[node]
+        except KeyError:
+            pass
+        else:
+            stats.cache_hits += 1
+            return result
+
+        inferred = []
+        start = time.perf_counter()
+        try:
+            for value in node.infer():
+                inferred.append(value)
+                if len(inferred) > self.max_inferred_values:
+                    self._give_up(stats, node, f"more than {self.max_inferred_values} values")
+                    inferred = []
+                    break
+                if self.max_seconds and time.perf_counter() - start > self.max_seconds:
+                    self._give_up(stats, node, f"more than {self.max_seconds}s")
+                    inferred = []
+                    break
+        except (astroid.InferenceError, RecursionError):
+            pass
+        finally:
+            stats.seconds += time.perf_counter() - start
+        result = self._cache[node] = tuple(inferred)
+        return result
+
+    def safe_infer(self, node):
+        """Return the single value inferred for the passed node.
+
+        ``None`` is returned if inference failed, the budget was exceeded or the values
+        inferred are ambiguous, i.e., not all of the same type.
+        """
+        inferred = self.infer(node)
+        if not inferred:
+            return None
+        value = inferred[0]
+        for other in inferred:
+            if isinstance(other, util.UninferableBase) or type(other) is not type(value):
+                return None
+        return value
+
+    @staticmethod
+    def _give_up(stats, node, reason):
+        stats.budget_exceeded += 1
+        log.debug(
+            "Giving up inferring %r at %s:%s, %s",
+            node.as_string(),
+            node.root().name,
+            node.lineno,
+            reason,
+        )
+
+
+TRACKER = InferenceTracker()
+
+
+def infer(node):
+    """Infer the passed node using the shared inference tracker."""
+    return TRACKER.infer(node)
+
+
+def safe_infer(node):
+    """Safely infer the passed node using the shared inference tracker."""
+    return TRACKER.safe_infer(node)
+
+
+def report_inference_stats(sect, stats, old_stats):
+    """Report the modules where most inference happened."""
+    if not TRACKER.stats:
+        raise EmptyReportError
+    lines = ["module", "calls", "cache hits", "gave up", "seconds"]
+    modules = sorted(
+        TRACKER.stats.items(),
+        key=lambda item: (item[1].seconds, item[1].calls),
+        reverse=True,
+    )
+    for modname, module_stats in modules[: InferenceChecker.report_max_modules]:
+        lines += [
+            modname,
+            str(module_stats.calls),
+            str(module_stats.cache_hits),
+            str(module_stats.budget_exceeded),
+            f"{module_stats.seconds:.3f}",
+        ]
+    sect.append(Table(children=lines, cols=5, rheaders=1))
+
+
+class InferenceChecker(BaseChecker):
+    """Configures the shared inference tracker and reports its statistics."""
+
+    name = "salt-inference"
+    msgs: ClassVar = {}
+    reports = (("RP9901", "Inference statistics", report_inference_stats),)
+    priority = -1
+
+    report_max_modules = 20
+
+    options = (
+        (
+            "inference-max-values",
+            {
+                "default": 100,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Maximum number of values inferred for a single node by the "
+                "saltpylint checkers before giving up",
+            },
+        ),
+        (
+            "inference-max-seconds",
+            {
+                "default": 5.0,
+                "type": "float",
+                "metavar": "<seconds>",
+                "help": "Maximum time spent inferring a single node by the saltpylint "
+                "checkers before giving up, only checked between the inferred values. "
+                "0 disables the time budget",
+            },
+        ),
+    )
+
+    def open(self):
+        super().open()
+        TRACKER.reset()
+
+
+def register(linter):
+    """Required method to auto register this checker."""
+    linter.register_checker(InferenceChecker(linter))
+
+
+def load_configuration(linter):
+    """Configure the shared inference tracker budget."""
+    TRACKER.max_inferred_values = linter.config.inference_max_values
+    TRACKER.max_seconds = linter.config.inference_max_seconds
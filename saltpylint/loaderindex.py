@@ -0,0 +1,374 @@
+"""
+saltpylint.loaderindex
+~~~~~~~~~~~~~~~~~~~~~~
+
+Builds a tree-wide index of Salt loader modules, recording, for each module, its
+``__virtualname__``, whether it defines ``__virtual__`` and the names of the public
+functions it exposes to the loader.
+
+The index is built in a single pass using the standard library ``ast`` module, no
+inference is involved, and it can be persisted to a cache file which is reused
+across runs for the files which haven't changed.
+
+It can be used as a pylint plugin, which flags duplicate virtual names within a
+loader directory, or as a standalone command::
+
+    python -m saltpylint.loaderindex --cache .loader-index.json salt/modules salt/states
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+
+from pylint.checkers import BaseChecker
+
+CACHE_VERSION = 2
+
+DEFAULT_LOADER_DIRS = (
+    "salt/auth",
+    "salt/beacons",
+    "salt/cache",
+    "salt/cloud/clouds",
+    "salt/engines",
+    "salt/executors",
+    "salt/fileserver",
+    "salt/grains",
+    "salt/matchers",
+    "salt/modules",
+    "salt/netapi",
+    "salt/output",
+    "salt/pillar",
+    "salt/proxy",
+    "salt/renderers",
+    "salt/returners",
+    "salt/roster",
+    "salt/runners",
+    "salt/sdb",
+    "salt/serializers",
+    "salt/states",
+    "salt/thorium",
+    "salt/tops",
+    "salt/tokens",
+    "salt/wheel",
+)
+
+
+def is_salt_loader_module(path, loader_dirs=DEFAULT_LOADER_DIRS):
+    """Return ``True`` if the passed module path is under one of the salt loader directories."""
+    if not path:
+        return False
+    path = "/" + path.replace(os.sep, "/")
+    return any(f"/{loader_dir}/" in path for loader_dir in loader_dirs)
+
+
+def get_loader_dirs(linter):
+    """Return the configured salt loader directories.
+
+    The ``salt-loader-dirs`` option is registered by the ``saltpylint.loaderindex`` plugin,
+    when it's not loaded, the default loader directories are returned.
+    """
+    return getattr(linter.config, "salt_loader_dirs", DEFAULT_LOADER_DIRS)
+
+
+def iter_module_statements(stmts):
+    """Yield the module level statements, including the ones under ``if`` and ``try`` blocks."""
+    for stmt in stmts:
+        if isinstance(stmt, ast.If):
+            yield from iter_module_statements(stmt.body)
+            yield from iter_module_statements(stmt.orelse)
+        elif isinstance(stmt, (ast.Try, getattr(ast, "TryStar", ast.Try))):
+            yield from iter_module_statements(stmt.body)
+            for handler in stmt.handlers:
+                yield from iter_module_statements(handler.body)
+            yield from iter_module_statements(stmt.orelse)
+            yield from iter_module_statements(stmt.finalbody)
+        else:
+            yield stmt
+
+
+def parse_loader_module(path):
+    """Parse a loader module and return its index entry.
+
+    The returned tuple is ``(virtualname, has_virtual, functions)`` where ``virtualname``
+    is the ``__virtualname__`` string, or ``None`` if not statically defined, and
+    ``functions`` is a sorted list of the public function names the loader exposes,
+    taking ``__func_alias__`` into account. Like the loader, which exposes the module
+    namespace, the functions defined under module level ``if`` and ``try`` blocks and the
+    names imported with ``from ... import ...`` are included.
+    """
+    with open(path, "rb") as rfh:
+        try:
+            tree = ast.parse(rfh.read(), filename=path)
+        except (SyntaxError, ValueError):
+            return None, False, []
+
+    virtualname = None
+    has_virtual = False
+    functions = set()
+    aliases = {}
+    for stmt in iter_module_statements(tree.body):
+        if isinstance(stmt, ast.ImportFrom):
+            functions.update(
+                alias.asname or alias.name for alias in stmt.names if alias.name != "*"
+            )
+            continue
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if stmt.name == "__virtual__":
+                has_virtual = True
+            functions.add(stmt.name)
+            continue
+        if isinstance(stmt, ast.Assign):
+            targets = [target.id for target in stmt.targets if isinstance(target, ast.Name)]
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            targets = [stmt.target.id]
+        else:
+            continue
+        for target in targets:
+            if target == "__virtualname__":
+                if isinstance(stmt.value, ast.Constant) and isinstance(stmt.value.value, str):
+                    virtualname = stmt.value.value
+            elif target == "__func_alias__":
+                if isinstance(stmt.value, ast.Dict):
+                    for key, value in zip(stmt.value.keys, stmt.value.values):
+                        if (
+                            isinstance(key, ast.Constant)
+                            and isinstance(value, ast.Constant)
+                            and isinstance(key.value, str)
+                            and isinstance(value.value, str)
+                        ):
+                            aliases[key.value] = value.value
+            elif isinstance(stmt.value, (ast.Call, ast.Name, ast.Attribute)):
+                # Salt modules also expose functions through assignments, for example,
+                # ``get = salt.utils.functools.namespaced_function(get, globals())``
+                functions.add(target)
+
+    public_functions = set()
+    for name in functions:
+        name = aliases.get(name, name)  # noqa: PLW2901
+        if not name.startswith("_"):
+            public_functions.add(name)
+    return virtualname, has_virtual, sorted(public_functions)
+
+
+class LoaderIndex:
+    """Index of the Salt loader modules found under a list of loader directories."""
+
+    def __init__(self, root, loader_dirs, cache_path=None):
+        self.root = root
+        self.loader_dirs = tuple(loader_dirs)
+        self.cache_path = cache_path
+        # Relative module path -> [mtime_ns, size, virtualname, has_virtual, functions]
+        self.modules = {}
+
+    @classmethod
+    def build(cls, root, loader_dirs, cache_path=None):
+        """Build, or refresh from the cache, the index and persist it back."""
+        index = cls(root, loader_dirs, cache_path=cache_path)
+        index.refresh()
+        return index
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.isfile(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as rfh:
+                data = json.load(rfh)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("modules") or {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        data = {"version": CACHE_VERSION, "modules": self.modules}
+        tmp_path = f"{self.cache_path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as wfh:
+                json.dump(data, wfh, separators=(",", ":"), sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # Not being able to write the cache is not fatal
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def iter_module_paths(self):
+        for loader_dir in self.loader_dirs:
+            dirpath = os.path.join(self.root, loader_dir)
+            if not os.path.isdir(dirpath):
+                continue
+            for entry in sorted(os.scandir(dirpath), key=lambda entry: entry.name):
+                if not entry.is_file() or not entry.name.endswith(".py"):
+                    continue
+                if entry.name == "__init__.py":
+                    continue
+                yield entry
+
+    def refresh(self):
+        """Index the loader modules, only re-parsing the files which changed."""
+        cached = self._load_cache()
+        modules = {}
+        changed = False
+        for entry in self.iter_module_paths():
+            relpath = os.path.relpath(entry.path, self.root).replace(os.sep, "/")
+            stat = entry.stat()
+            cached_entry = cached.get(relpath)
+            if cached_entry and cached_entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+                modules[relpath] = cached_entry
+                continue
+            virtualname, has_virtual, functions = parse_loader_module(entry.path)
+            modules[relpath] = [stat.st_mtime_ns, stat.st_size, virtualname, has_virtual, functions]
+            changed = True
+        self.modules = modules
+        if changed or len(modules) != len(cached):
+            self._save_cache()
+
+    @staticmethod
+    def effective_name(relpath, entry):
+        """Return the name the loader uses for the module.
+
+        The loader only honors ``__virtualname__`` for modules which define ``__virtual__``,
+        the other modules are loaded under their file name.
+        """
+        virtualname = entry[2]
+        if virtualname and entry[3]:
+            return virtualname
+        return os.path.splitext(os.path.basename(relpath))[0]
+
+    def function_index(self):
+        """Return the set of loader names and the set of ``<name>.<function>`` strings."""
+        names = set()
+        functions = set()
+        for relpath, entry in self.modules.items():
+            name = self.effective_name(relpath, entry)
+            names.add(name)
+            functions.update(f"{name}.{function}" for function in entry[4])
+        return names, functions
+
+    def duplicate_virtualnames(self):
+        """Return the modules sharing a virtual name within the same loader directory.
+
+        The returned mapping is ``{(loader_dir, name): [relpath, ...]}`` and it only
+        includes groups where at least one of the modules does not define ``__virtual__``,
+        since modules which all define ``__virtual__`` are expected to be mutually
+        exclusive, like ``aptpkg`` and ``yumpkg`` both providing ``pkg``.
+        """
+        groups = {}
+        for relpath, entry in self.modules.items():
+            key = (os.path.dirname(relpath), self.effective_name(relpath, entry))
+            groups.setdefault(key, []).append(relpath)
+        return {
+            key: relpaths
+            for key, relpaths in groups.items()
+            if len(relpaths) > 1 and not all(self.modules[relpath][3] for relpath in relpaths)
+        }
+
+
+_LOADER_INDEXES = {}
+
+
+def get_loader_index(root, loader_dirs, cache_path=None):
+    """Return the loader index for the passed arguments, building it only once per run."""
+    key = (root, tuple(loader_dirs), cache_path)
+    if key not in _LOADER_INDEXES:
+        _LOADER_INDEXES[key] = LoaderIndex.build(root, loader_dirs, cache_path=cache_path)
+    return _LOADER_INDEXES[key]
+
+
+LOADER_INDEX_MSGS = {
+    "W9701": (
+        "Duplicate loader virtual name %r, also used by: %s",
+        "duplicate-loader-virtualname",
+        "Several modules in the same loader directory share the same virtual name "
+        "and not all of them define __virtual__. The loader will silently pick one of them.",
+    ),
+}
+
+
+class LoaderIndexChecker(BaseChecker):
+    name = "salt-loader-index"
+    msgs = LOADER_INDEX_MSGS
+    priority = -2
+
+    options = (
+        (
+            "salt-loader-dirs",
+            {
+                "default": DEFAULT_LOADER_DIRS,
+                "type": "csv",
+                "metavar": "<comma-separated-list>",
+                "help": "Salt loader directories, relative to the current working directory, "
+                "separated by a comma",
+            },
+        ),
+        (
+            "salt-loader-index-cache",
+            {
+                "default": "",
+                "type": "string",
+                "metavar": "<path>",
+                "help": "Path to the file where the salt loader index is cached across runs. "
+                "Empty to disable caching",
+            },
+        ),
+    )
+
+    def open(self):
+        super().open()
+        self.loader_index = get_loader_index(
+            os.getcwd(),
+            self.linter.config.salt_loader_dirs,
+            cache_path=self.linter.config.salt_loader_index_cache or None,
+        )
+        self.duplicates = {}
+        for (_, name), relpaths in self.loader_index.duplicate_virtualnames().items():
+            for relpath in relpaths:
+                self.duplicates[relpath] = (name, [path for path in relpaths if path != relpath])
+
+    def visit_module(self, node):
+        if not self.duplicates or not node.file:
+            return
+        relpath = os.path.relpath(node.file, self.loader_index.root).replace(os.sep, "/")
+        try:
+            name, others = self.duplicates[relpath]
+        except KeyError:
+            return
+        self.add_message(
+            "duplicate-loader-virtualname",
+            node=node,
+            args=(name, ", ".join(others)),
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m saltpylint.loaderindex",
+        description="Index the salt loader modules and report duplicate virtual names.",
+    )
+    parser.add_argument(
+        "loader_dirs",
+        nargs="*",
+        default=DEFAULT_LOADER_DIRS,
+        help="Loader directories relative to --root",
+    )
+    parser.add_argument("--root", default=os.getcwd(), help="Root of the salt source tree")
+    parser.add_argument("--cache", default=None, help="Path to the loader index cache file")
+    options = parser.parse_args(argv)
+
+    index = LoaderIndex.build(options.root, options.loader_dirs, cache_path=options.cache)
+    duplicates = index.duplicate_virtualnames()
+    for (loader_dir, name), relpaths in sorted(duplicates.items()):
+        print(f"{loader_dir}: duplicate virtual name {name!r}: {', '.join(relpaths)}")  # noqa: T201
+    return 1 if duplicates else 0
+
+
+def register(linter):
+    """Required method to auto register this checker."""
+    linter.register_checker(LoaderIndexChecker(linter))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
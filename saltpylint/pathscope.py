@@ -0,0 +1,126 @@
+"""
+saltpylint.pathscope
+~~~~~~~~~~~~~~~~~~~~
+
+Restricts checkers to the modules under some paths. For example, test only checkers
+to ``tests/`` and loader only checkers to ``salt/``:
+
+.. code-block:: ini
+
+    [PATH-SCOPE]
+    checker-path-scopes=moved-test-case-class=tests/*,
+                        blacklisted-unmocked-patching=tests/*,
+                        virt-checker=salt/*
+
+The globs are matched against the module paths relative to the current working
+directory, and a checker can be listed several times. The globs are compiled once per
+run into a single regular expression per checker, and the activation of each checker is
+only computed once per module. The ``visit_*`` and ``leave_*`` callbacks of a checker
+which is not active for a module are not called.
+"""
+
+import os
+from typing import ClassVar
+
+from pylint.checkers import BaseChecker
+
+from saltpylint.utils import compile_globs
+
+
+class _ScopedCallback:
+    """Only calls the wrapped checker callback for the modules the checker is active on."""
+
+    def __init__(self, scope_checker, checker, callback):
+        self.scope_checker = scope_checker
+        self.checker_name = checker.name
+        self.callback = callback
+        if hasattr(callback, "checks_msgs"):
+            # Preserve pylint's ``only_required_for_messages`` information
+            self.checks_msgs = callback.checks_msgs
+
+    def __call__(self, node):
+        if self.checker_name in self.scope_checker.get_inactive_checkers():
+            return None
+        return self.callback(node)
+
+
+class PathScopeChecker(BaseChecker):
+    """Activates checkers only for the modules matching their configured paths."""
+
+    name = "path-scope"
+    msgs: ClassVar = {}
+    priority = -1
+
+    options = (
+        (
+            "checker-path-scopes",
+            {
+                "default": (),
+                "type": "csv",
+                "metavar": "<checker-name=glob>",
+                "help": "Restrict checkers to the modules matching the globs, relative to the "
+                "current working directory, as checker-name=glob pairs separated by a comma",
+            },
+        ),
+    )
+
+    def __init__(self, linter=None) -> None:
+        BaseChecker.__init__(self, linter)
+        self.root = None
+        self.scopes = {}
+        self.current_file = None
+        self.inactive_checkers = frozenset()
+
+    def compile_scopes(self):
+        """Compile the configured globs into a regular expression per checker."""
+        globs = {}
+        for entry in self.linter.config.checker_path_scopes:
+            checker_name, _, glob = entry.partition("=")
+            checker_name = checker_name.strip()
+            glob = glob.strip()
+            if not checker_name or not glob:
+                continue
+            globs.setdefault(checker_name, []).append(glob)
+        self.root = os.getcwd()
+        self.scopes = {
+            checker_name: compile_globs(patterns) for checker_name, patterns in globs.items()
+        }
+
+    def install(self):
+        """Wrap the callbacks of the checkers with a path scope."""
+        self.compile_scopes()
+        for checker in self.linter.get_checkers():
+            if checker.name not in self.scopes:
+                continue
+            for member in dir(checker):
+                if not member.startswith(("visit_", "leave_")):
+                    continue
+                callback = getattr(checker, member)
+                if not callable(callback) or isinstance(callback, _ScopedCallback):
+                    continue
+                setattr(checker, member, _ScopedCallback(self, checker, callback))
+
+    def get_inactive_checkers(self):
+        """Return the names of the checkers which are not active for the current module."""
+        current_file = self.linter.current_file
+        if current_file != self.current_file:
+            self.current_file = current_file
+            relpath = os.path.relpath(current_file or "", self.root).replace(os.sep, "/")
+            self.inactive_checkers = frozenset(
+                checker_name
+                for checker_name, scope in self.scopes.items()
+                if not scope.match(relpath)
+            )
+        return self.inactive_checkers
+
+
+def register(linter):
+    """Required method to auto register this checker."""
+    linter.register_checker(PathScopeChecker(linter))
+
+
+def load_configuration(linter):
+    """Wrap the scoped checkers once all plugins are loaded and configured."""
+    for checker in linter.get_checkers():
+        if isinstance(checker, PathScopeChecker):
+            checker.install()
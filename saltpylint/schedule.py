@@ -0,0 +1,224 @@
+"""
+saltpylint.schedule
+~~~~~~~~~~~~~~~~~~~
+
+Lints the files most likely to fail first, optionally stopping after the first errors.
+
+Pre-merge CI mostly wants to know whether there's an error, as early as possible. This run
+mode orders the files to lint using a local failure history, the files with the most
+messages in the recent runs first, followed by the most recently modified files, and lints
+them in small batches, streaming the messages as they're found::
+
+    python -m saltpylint.schedule --fail-fast 1 salt tests -- --rcfile=.pylintrc
+
+The pylint options go after ``--``. With ``--fail-fast K`` the run stops after the batch
+which reached K error level messages from the saltpylint checkers. Since each batch is
+checked on its own, checks spanning several modules, like ``duplicate-code``, only see the
+modules of a batch.
+
+The history is a compact JSON file mapping each file which had messages to its decayed
+message count and its message count in the last run where it was linted::
+
+    {"salt/modules/file.py": [3.5, 2], "tests/unit/test_loader.py": [0.25, 0]}
+
+It's updated incrementally after each run, only for the files which were linted, halving
+the previous count before adding the new one. Files whose decayed count drops below
+``MIN_SCORE`` are dropped from it. With ``--record-timings`` the per-file lint times of the
+linted files are also merged into a timings file, as used by ``saltpylint.shard``.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from pylint.constants import MSG_TYPES_STATUS
+from pylint.reporters.text import TextReporter
+
+from saltpylint.shard import TimingRun
+from saltpylint.shard import iter_python_files
+from saltpylint.shard import save_timings
+
+DEFAULT_HISTORY_PATH = ".saltpylint-history.json"
+HISTORY_DECAY = 0.5
+MIN_SCORE = 0.01
+# Each history entry is ``[decayed_count, last_count]``
+HISTORY_ENTRY_LENGTH = 2
+
+
+class FailureHistory:
+    """The per-file decayed message counts of the previous runs."""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as rfh:
+                data = json.load(rfh)
+        except (OSError, ValueError):
+            return self
+        self.files = {
+            os.path.normpath(filename): entry
+            for filename, entry in data.items()
+            if isinstance(entry, list) and len(entry) == HISTORY_ENTRY_LENGTH
+        }
+        return self
+
+    def score(self, filename):
+        entry = self.files.get(filename)
+        if entry is None:
+            return 0
+        return entry[0]
+
+    def update(self, counts):
+        """Record the message counts of the files linted in a run."""
+        for filename, count in counts.items():
+            score = round(self.score(filename) * HISTORY_DECAY + count, 3)
+            if score < MIN_SCORE:
+                self.files.pop(filename, None)
+            else:
+                self.files[filename] = [score, count]
+
+    def save(self):
+        self.files = {
+            filename: entry for filename, entry in self.files.items() if os.path.isfile(filename)
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as wfh:
+            json.dump(self.files, wfh, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def order_files(filenames, history):
+    """Order the files by failure history and then by the most recently modified."""
+
+    def get_mtime(filename):
+        try:
+            return os.stat(filename).st_mtime_ns
+        except OSError:
+            return 0
+
+    return sorted(
+        filenames,
+        key=lambda filename: (-history.score(filename), -get_mtime(filename), filename),
+    )
+
+
+class SchedulingReporter(TextReporter):
+    """Streams the messages and counts them per file and the saltpylint errors."""
+
+    def __init__(self, output=None):
+        super().__init__(output)
+        self.counts = {}
+        self.errors = 0
+        self.msg_status = 0
+        self.saltpylint_msgids = None
+
+    def handle_message(self, msg):
+        super().handle_message(msg)
+        self.out.flush()
+        filename = os.path.relpath(msg.abspath)
+        self.counts[filename] = self.counts.get(filename, 0) + 1
+        self.msg_status |= MSG_TYPES_STATUS[msg.C]
+        if self.saltpylint_msgids is None:
+            self.saltpylint_msgids = get_saltpylint_msgids(self.linter)
+        if msg.category in ("error", "fatal") and msg.msg_id in self.saltpylint_msgids:
+            self.errors += 1
+
+
+def get_saltpylint_msgids(linter):
+    """Return the message ids of the checkers defined by saltpylint."""
+    return frozenset(
+        msgid
+        for checker in linter.get_checkers()
+        if type(checker).__module__.startswith("saltpylint.")
+        for msgid in checker.msgs
+    )
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    pylint_args = []
+    if "--" in argv:
+        idx = argv.index("--")
+        argv, pylint_args = argv[:idx], argv[idx + 1 :]
+
+    parser = argparse.ArgumentParser(
+        prog="python -m saltpylint.schedule",
+        description="Lint the files most likely to fail first. Pass the pylint options after '--'.",
+    )
+    parser.add_argument("paths", nargs="+", help="Files and directories to lint")
+    parser.add_argument(
+        "--history",
+        default=DEFAULT_HISTORY_PATH,
+        help=f"Path of the failure history file. Default: {DEFAULT_HISTORY_PATH}",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Stop after the first K error level messages from the saltpylint checkers",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="Number of files checked at once, and how often --fail-fast is evaluated",
+    )
+    parser.add_argument(
+        "--record-timings",
+        default=None,
+        metavar="TIMINGS",
+        help="Merge the per-file lint times of this run into this timings JSON",
+    )
+    options = parser.parse_args(argv)
+    if options.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    history = FailureHistory(options.history).load()
+    filenames = order_files(
+        sorted({os.path.relpath(filename) for filename in iter_python_files(options.paths)}),
+        history,
+    )
+    if not filenames:
+        parser.error("No python files found to lint")
+    batches = [
+        filenames[idx : idx + options.batch_size]
+        for idx in range(0, len(filenames), options.batch_size)
+    ]
+
+    reporter = SchedulingReporter(sys.stdout)
+    linted = []
+    # The first batch goes through Run to load the plugins and the configuration, the
+    # following batches reuse the configured linter
+    run = TimingRun(
+        [*pylint_args, "--jobs=1", "--reports=n", "--score=n", *batches[0]],
+        reporter=reporter,
+        exit=False,
+    )
+    linted.extend(batches[0])
+    for batch in batches[1:]:
+        if options.fail_fast and reporter.errors >= options.fail_fast:
+            break
+        run.linter.check(batch)
+        linted.extend(batch)
+
+    history.update({filename: reporter.counts.get(filename, 0) for filename in linted})
+    history.save()
+    if options.record_timings:
+        save_timings(options.record_timings, run.linter.timings)
+    if len(linted) < len(filenames):
+        print(  # noqa: T201
+            f"saltpylint schedule: stopped after {reporter.errors} saltpylint errors, "
+            f"{len(linted)} of {len(filenames)} files linted",
+            file=sys.stderr,
+        )
+    return reporter.msg_status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
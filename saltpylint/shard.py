@@ -0,0 +1,224 @@
+"""
+saltpylint.shard
+~~~~~~~~~~~~~~~~
+
+Splits the list of files to lint into N shards with a balanced predicted cost, so
+full-tree runs can be spread across several CI nodes, and merges the per shard
+pylint JSON reports back together.
+
+The predicted cost of each file comes from historical per-file timing data, a JSON
+file mapping file paths to the seconds it took to lint them::
+
+    {"salt/modules/file.py": 12.4, "tests/unit/test_loader.py": 8.1}
+
+It's produced by the ``--record-timings`` option of ``saltpylint.forkrun`` and
+``saltpylint.schedule``, which time the parsing and checking of each file with
+``TimingRun`` and merge the new timings into the file.
+
+Files without history are estimated from their size, scaled by the average seconds
+per byte of the files with history, or just their size when there's no history at all.
+The shards are then built using the Longest Processing Time first (LPT) greedy
+algorithm::
+
+    python -m saltpylint.shard split --shards 4 --timings timings.json --output-dir shards salt tests
+    python -m saltpylint.shard merge --output report.json shards/report-*.json
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+
+from pylint.lint import PyLinter
+from pylint.lint import Run
+
+
+def iter_python_files(paths):
+    """Yield the python files found in the passed paths."""
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.normpath(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith("."))
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    yield os.path.normpath(os.path.join(dirpath, filename))
+
+
+def load_timings(path):
+    """Load the historical per-file timings, returning an empty mapping if not available."""
+    if not path or not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as rfh:
+        data = json.load(rfh)
+    return {os.path.normpath(filename): float(seconds) for filename, seconds in data.items()}
+
+
+def save_timings(path, timings):
+    """Merge the passed per-file timings into the timings file."""
+    merged = load_timings(path)
+    merged.update(timings)
+    merged = {
+        filename: round(seconds, 3)
+        for filename, seconds in sorted(merged.items())
+        if os.path.isfile(filename)
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as wfh:
+        json.dump(merged, wfh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class TimingPyLinter(PyLinter):
+    """A linter which records the seconds spent parsing and checking each file."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = {}
+
+    def _record(self, filepath, start):
+        if filepath:
+            filename = os.path.relpath(filepath)
+            self.timings[filename] = self.timings.get(filename, 0) + time.perf_counter() - start
+
+    def get_ast(self, filepath, modname, data=None):
+        start = time.perf_counter()
+        try:
+            return super().get_ast(filepath, modname, data)
+        finally:
+            self._record(filepath, start)
+
+    def check_astroid_module(self, ast_node, walker, rawcheckers, tokencheckers):
+        start = time.perf_counter()
+        try:
+            return super().check_astroid_module(ast_node, walker, rawcheckers, tokencheckers)
+        finally:
+            self._record(ast_node.file, start)
+
+
+class TimingRun(Run):
+    """Runs pylint with ``TimingPyLinter``, saving its timings to ``timings_path`` if passed.
+
+    The timings are saved even when the run exits, so they're recorded on normal
+    ``pylint`` exits too.
+    """
+
+    LinterClass = TimingPyLinter
+
+    def __init__(self, args, timings_path=None, **kwargs):
+        try:
+            super().__init__(args, **kwargs)
+        finally:
+            if timings_path and hasattr(self, "linter"):
+                save_timings(timings_path, self.linter.timings)
+
+
+def predict_costs(filenames, timings):
+    """Return a mapping of each file to its predicted cost."""
+    sizes = {}
+    for filename in filenames:
+        try:
+            sizes[filename] = os.path.getsize(filename)
+        except OSError:
+            sizes[filename] = 0
+
+    known = [filename for filename in filenames if filename in timings]
+    known_size = sum(sizes[filename] for filename in known)
+    if known and known_size:
+        seconds_per_byte = sum(timings[filename] for filename in known) / known_size
+    else:
+        seconds_per_byte = 1
+
+    costs = {}
+    for filename in filenames:
+        if filename in timings:
+            costs[filename] = timings[filename]
+        else:
+            costs[filename] = sizes[filename] * seconds_per_byte
+    return costs
+
+
+def partition(costs, shards):
+    """Partition the files into ``shards`` lists using the LPT greedy algorithm.
+
+    Returns a list of ``(predicted_cost, filenames)`` tuples, one per shard.
+    """
+    heap = [(0, index, []) for index in range(shards)]
+    for filename in sorted(costs, key=lambda filename: (-costs[filename], filename)):
+        total, index, filenames = heapq.heappop(heap)
+        filenames.append(filename)
+        heapq.heappush(heap, (total + costs[filename], index, filenames))
+    return [(total, sorted(filenames)) for total, _, filenames in sorted(heap, key=lambda x: x[1])]
+
+
+def split(options):
+    filenames = sorted(set(iter_python_files(options.paths)))
+    costs = predict_costs(filenames, load_timings(options.timings))
+    os.makedirs(options.output_dir, exist_ok=True)
+    for index, (total, shard_filenames) in enumerate(partition(costs, options.shards)):
+        shard_path = os.path.join(options.output_dir, f"shard-{index}.txt")
+        with open(shard_path, "w", encoding="utf-8") as wfh:
+            wfh.writelines(f"{filename}\n" for filename in shard_filenames)
+        print(  # noqa: T201
+            f"{shard_path}: {len(shard_filenames)} files, predicted cost {total:.2f}",
+        )
+    return 0
+
+
+def merge_reports(report_paths):
+    """Return the messages of the passed pylint JSON reports, sorted by location."""
+    messages = []
+    for report_path in report_paths:
+        with open(report_path, encoding="utf-8") as rfh:
+            messages.extend(json.load(rfh))
+    messages.sort(key=lambda msg: (msg.get("path", ""), msg.get("line", 0), msg.get("column", 0)))
+    return messages
+
+
+def merge(options):
+    messages = merge_reports(options.reports)
+    with open(options.output, "w", encoding="utf-8") as wfh:
+        json.dump(messages, wfh, indent=4)
+    print(  # noqa: T201
+        f"{options.output}: {len(messages)} messages merged from {len(options.reports)} reports",
+    )
+    return 1 if messages else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m saltpylint.shard",
+        description="Split the files to lint into cost balanced shards and merge their reports.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    split_parser = subparsers.add_parser("split", help="Split the files to lint into shards")
+    split_parser.add_argument("paths", nargs="+", help="Files and directories to lint")
+    split_parser.add_argument("--shards", type=int, required=True, help="Number of shards")
+    split_parser.add_argument("--timings", default=None, help="Historical per-file timings JSON")
+    split_parser.add_argument(
+        "--output-dir",
+        default=".",
+        help="Directory where to write the shard-<N>.txt file lists",
+    )
+    split_parser.set_defaults(func=split)
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Merge the shards pylint JSON reports, exits 1 if there are any messages",
+    )
+    merge_parser.add_argument("reports", nargs="+", help="The shards pylint JSON reports")
+    merge_parser.add_argument("--output", required=True, help="Path of the merged JSON report")
+    merge_parser.set_defaults(func=merge)
+
+    options = parser.parse_args(argv)
+    if options.command == "split" and options.shards < 1:
+        parser.error("--shards must be at least 1")
+    return options.func(options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
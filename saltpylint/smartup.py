@@ -10,6 +10,99 @@ A bridge between the `pep8`_ library and PyLint
 
 from astroid import MANAGER
 from astroid import nodes
+from astroid.builder import AstroidBuilder
+
+from saltpylint.loaderindex import DEFAULT_LOADER_DIRS
+from saltpylint.loaderindex import get_loader_dirs
+from saltpylint.loaderindex import is_salt_loader_module
+from saltpylint.utils import SALT_DUNDERS
+
+# Salt loader dunders which map ``<virtualname>.<function>`` to loaded functions returning
+# serializable data
+SALT_LOADER_FUNCTIONS_DUNDERS = (
+    "__salt__",
+    "__runner__",
+    "__thorium__",
+    "__states__",
+    "__ret__",
+    "__ext_pillar__",
+    "__sdb__",
+)
+SALT_LOADER_STRING_DUNDERS = ("__orchestration_jid__", "__intance_id__", "__env__")
+SALT_LOADER_LIST_DUNDERS = ("__lowstate__",)
+# Salt loader dunders which are dicts with well known keys, mapped to the type of their value.
+# The items not listed, like the ones of the dunders not listed at all, are left uninferable.
+SALT_LOADER_DICT_DUNDERS = {
+    "__opts__": {
+        "cachedir": "str",
+        "conf_file": "str",
+        "extension_modules": "str",
+        "file_roots": "dict",
+        "grains": "dict",
+        "hash_type": "str",
+        "id": "str",
+        "pillar": "dict",
+        "pillar_roots": "dict",
+        "pki_dir": "str",
+        "renderer": "str",
+        "sock_dir": "str",
+        "test": "bool",
+        "transport": "str",
+        "user": "str",
+    },
+    "__grains__": {
+        "cpuarch": "str",
+        "domain": "str",
+        "fqdn": "str",
+        "fqdn_ip4": "list",
+        "fqdn_ip6": "list",
+        "host": "str",
+        "hwaddr_interfaces": "dict",
+        "id": "str",
+        "init": "str",
+        "ip4_interfaces": "dict",
+        "ip6_interfaces": "dict",
+        "ip_interfaces": "dict",
+        "ipv4": "list",
+        "ipv6": "list",
+        "kernel": "str",
+        "kernelrelease": "str",
+        "mem_total": "int",
+        "nodename": "str",
+        "num_cpus": "int",
+        "os": "str",
+        "os_family": "str",
+        "oscodename": "str",
+        "osfinger": "str",
+        "osmajorrelease": "int",
+        "osrelease": "str",
+        "saltversion": "str",
+        "virtual": "str",
+    },
+    "__low__": {
+        "__id__": "str",
+        "fun": "str",
+        "name": "str",
+        "state": "str",
+    },
+}
+
+SALT_LOADER_DUNDERS_STUB = """
+def salt_loader_function(*args, **kwargs):
+    # Loaded functions return serializable data, astroid infers the union of these types
+    for ret in (str(), bool(), int(), float(), list(), dict()):
+        return ret
+
+
+class SaltLoaderFunctions(dict):
+    def __getitem__(self, key):
+        return salt_loader_function
+
+    def get(self, key, default=None):
+        return salt_loader_function
+"""
+
+_salt_loader_dunders_stub = None
 
 
 def rootlogger_transform(obj):
@@ -26,9 +119,57 @@ def rootlogger_transform(obj):
         obj.garbage = _inject_method
 
 
+def get_salt_loader_dunders_stub():
+    """Return the astroid module defining the salt loader dunders stubs, built only once."""
+    global _salt_loader_dunders_stub  # noqa: PLW0603  pylint: disable=global-statement
+    if _salt_loader_dunders_stub is None:
+        code = [SALT_LOADER_DUNDERS_STUB]
+        for dunder in SALT_DUNDERS:
+            if dunder in SALT_LOADER_FUNCTIONS_DUNDERS:
+                code.append(f"{dunder} = SaltLoaderFunctions()")
+            elif dunder in SALT_LOADER_DICT_DUNDERS:
+                items = ", ".join(
+                    f"{key!r}: {value_type}()"
+                    for key, value_type in SALT_LOADER_DICT_DUNDERS[dunder].items()
+                )
+                code.append(f"{dunder} = {{{items}}}")
+            elif dunder in SALT_LOADER_STRING_DUNDERS:
+                code.append(f"{dunder} = str()")
+            elif dunder in SALT_LOADER_LIST_DUNDERS:
+                code.append(f"{dunder} = list()")
+            else:
+                # __context__, __pillar__, __utils__ and friends hold arbitrary objects
+                code.append(f"{dunder} = dict()")
+        _salt_loader_dunders_stub = AstroidBuilder(MANAGER).string_build(
+            "\n".join(code),
+            modname="saltpylint._salt_loader_dunders",
+        )
+    return _salt_loader_dunders_stub
+
+
+def salt_loader_dunders_transform(module, loader_dirs=DEFAULT_LOADER_DIRS):
+    """Inject the salt loader dunders into salt loader modules.
+
+    Otherwise, since they are injected by salt's loader at runtime, every reference to
+    them fails inference, and each inference based check retries it.
+    """
+    if not is_salt_loader_module(module.file, loader_dirs):
+        return
+    stub = get_salt_loader_dunders_stub()
+    for dunder in SALT_DUNDERS:
+        if dunder not in module.locals:
+            module.locals[dunder] = stub.locals[dunder]
+
+
 def register(linter):
     """Register the transformation functions."""
     try:
         MANAGER.register_transform(nodes.Class, rootlogger_transform)
     except AttributeError:
         MANAGER.register_transform(nodes.ClassDef, rootlogger_transform)
+
+    def _salt_loader_dunders_transform(module):
+        # The configuration is only loaded after the plugins are registered
+        salt_loader_dunders_transform(module, get_loader_dirs(linter))
+
+    MANAGER.register_transform(nodes.Module, _salt_loader_dunders_transform)
@@ -7,16 +7,23 @@ and raises a lint error if an import not in that known 3rd-party modules list
 is not gated.
 """
 
+import importlib.metadata
+import json
 import os
 import pkgutil
+import re
 from typing import ClassVar
 
 import astroid
 import astroid.exceptions
+from astroid import nodes
 from astroid.modutils import is_relative
 from astroid.modutils import is_standard_module
 from pylint.checkers import BaseChecker
 
+from saltpylint.loaderindex import get_loader_dirs
+from saltpylint.loaderindex import is_salt_loader_module
+
 MSGS = {
     "W8410": (
         "3rd-party module import is not gated in a try/except: %r",
@@ -34,6 +41,126 @@ MSGS = {
 }
 
 
+REQUIREMENT_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+LOCK_FILE_PACKAGE_NAME_RE = re.compile(r"^name\s*=\s*[\"']([^\"']+)[\"']")
+
+
+def normalize_distribution_name(name):
+    """Normalize a distribution name as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirements_file(path, seen=None):
+    """Return the normalized distribution names declared in a requirements or lock file.
+
+    Supports pip requirements files, following ``-r``/``-c`` includes, ``Pipfile.lock`` and
+    the TOML lock files which list ``[[package]]`` tables, like ``poetry.lock`` or ``uv.lock``.
+    """
+    if seen is None:
+        seen = set()
+    path = os.path.abspath(path)
+    if path in seen or not os.path.isfile(path):
+        return set()
+    seen.add(path)
+
+    with open(path, encoding="utf-8") as rfh:
+        contents = rfh.read()
+
+    names = set()
+    if path.endswith(".json") or os.path.basename(path) == "Pipfile.lock":
+        try:
+            data = json.loads(contents)
+        except ValueError:
+            return names
+        for section in ("default", "develop"):
+            names.update(normalize_distribution_name(name) for name in data.get(section) or {})
+        return names
+
+    if path.endswith(".lock"):
+        inside_package = False
+        for line in contents.splitlines():
+            line = line.strip()  # noqa: PLW2901
+            if line.startswith("["):
+                inside_package = line == "[[package]]"
+                continue
+            if inside_package:
+                match = LOCK_FILE_PACKAGE_NAME_RE.match(line)
+                if match:
+                    names.add(normalize_distribution_name(match.group(1)))
+        return names
+
+    for line in contents.splitlines():
+        line = line.split(" #", 1)[0].strip()  # noqa: PLW2901
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith(("-r ", "-c ", "--requirement ", "--constraint ")):
+            included = line.split(None, 1)[1].strip()
+            names.update(
+                parse_requirements_file(os.path.join(os.path.dirname(path), included), seen=seen),
+            )
+            continue
+        if "#egg=" in line:
+            names.add(normalize_distribution_name(line.split("#egg=", 1)[1].split("&", 1)[0]))
+            continue
+        if line.startswith("-"):
+            # Any other pip option
+            continue
+        match = REQUIREMENT_NAME_RE.match(line)
+        if match:
+            names.add(normalize_distribution_name(match.group(1)))
+    return names
+
+
+def get_distributions_top_level_names():
+    """Return a mapping of normalized distribution names to their top-level import names."""
+    top_level_names = {}
+    for distribution in importlib.metadata.distributions():
+        try:
+            name = normalize_distribution_name(distribution.metadata["Name"])
+        except (KeyError, TypeError):
+            continue
+        modnames = set()
+        top_level = distribution.read_text("top_level.txt")
+        if top_level:
+            modnames.update(line.strip() for line in top_level.splitlines() if line.strip())
+        else:
+            for file in distribution.files or ():
+                parts = file.parts
+                if not parts or parts[0].endswith((".dist-info", ".egg-info")) or parts[0] == "..":
+                    continue
+                if len(parts) > 1:
+                    modnames.add(parts[0])
+                elif parts[0].endswith(".py"):
+                    modnames.add(parts[0][:-3])
+        top_level_names.setdefault(name, set()).update(modnames)
+    return top_level_names
+
+
+def parse_import_times(path):
+    """Return a mapping of module names to their cumulative import time, in microseconds.
+
+    The passed file is either the ``stderr`` output of ``python -X importtime`` or a JSON
+    file mapping module names to microseconds.
+    """
+    with open(path, encoding="utf-8") as rfh:
+        contents = rfh.read()
+    if path.endswith(".json"):
+        return {modname: int(usecs) for modname, usecs in json.loads(contents).items()}
+    import_times = {}
+    for line in contents.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, cumulative, modname = line[len("import time:") :].split("|")
+            cumulative = int(cumulative)
+        except ValueError:
+            # The header line
+            continue
+        modname = modname.strip()
+        import_times[modname] = max(cumulative, import_times.get(modname, 0))
+    return import_times
+
+
 def get_import_package(modname):
     """Return the import package.
 
@@ -57,6 +184,17 @@ class ThirdPartyImportsChecker(BaseChecker):
                 "help": "Known 3rd-party modules which don' require being gated, separated by a comma",
             },
         ),
+        (
+            "known-3rd-party-requirements-files",
+            {
+                "default": (),
+                "type": "csv",
+                "metavar": "<requirements-files>",
+                "help": "Requirements or lock files declaring the project's 3rd-party packages, "
+                "separated by a comma. Imports of those packages are classified as 3rd-party "
+                "without importing them",
+            },
+        ),
     )
 
     known_py3_modules: ClassVar = ["builtins"]
@@ -79,50 +217,57 @@ class ThirdPartyImportsChecker(BaseChecker):
     )
     win_modules = ("msilib", "msvcrt", "winreg", "winsound", "ntpath")
 
-    all_modules: ClassVar = {m[1]: m[0] for m in pkgutil.iter_modules()}
-    std_modules_path: ClassVar = all_modules["os"]
-    std_modules: ClassVar = []
-    for mod, path in all_modules.items():
-        if path == std_modules_path and mod not in unix_modules + win_modules:
-            std_modules.append(mod)
-
-    known_std_modules = known_py3_modules + std_modules
+    _known_std_modules: ClassVar = None
+
+    @classmethod
+    def get_known_std_modules(cls):
+        """Return the known standard library modules.
+
+        Scanning the available modules is expensive, so it's deferred until the checker is
+        actually needed, i.e., opened by pylint, and only done once per process.
+        """
+        if cls._known_std_modules is None:
+            all_modules = {m[1]: m[0] for m in pkgutil.iter_modules()}
+            std_modules_path = all_modules["os"]
+            std_modules = []
+            for mod, path in all_modules.items():
+                if path == std_modules_path and mod not in cls.unix_modules + cls.win_modules:
+                    std_modules.append(mod)
+            cls._known_std_modules = frozenset(cls.known_py3_modules + std_modules)
+        return cls._known_std_modules
 
     def __init__(self, linter=None) -> None:
         BaseChecker.__init__(self, linter)
-        self._inside_try_except = False
-        self._inside_funcdef = False
-        self._inside_if = False
         self.cwd = None
+        self.known_std_modules = frozenset()
         self.allowed_3rd_party_modules = []
+        self.requirements_modules = set()
 
     def open(self):
         super().open()
         self.cwd = os.getcwd()
+        self.known_std_modules = self.get_known_std_modules()
         self.allowed_3rd_party_modules = set(
             self.linter.config.allowed_3rd_party_modules,
         )  # pylint: disable=no-member
-
-    # pylint: disable=unused-argument
-    def visit_if(self, node):
-        self._inside_if = True
-
-    def leave_if(self, node):
-        self._inside_if = True
-
-    def visit_try(self, node):
-        self._inside_try_except = True
-
-    def leave_try(self, node):
-        self._inside_try_except = False
-
-    def visit_functiondef(self, node):
-        self._inside_funcdef = True
-
-    def leave_functiondef(self, node):
-        self._inside_funcdef = False
-
-    # pylint: enable=unused-argument
+        self.requirements_modules = self._get_requirements_modules()
+
+    def _get_requirements_modules(self):
+        """Return the top-level import names of the distributions declared in requirements."""
+        distribution_names = set()
+        for path in self.linter.config.known_3rd_party_requirements_files:
+            distribution_names.update(parse_requirements_file(path))
+        if not distribution_names:
+            return set()
+        top_level_names = get_distributions_top_level_names()
+        modnames = set()
+        for distribution_name in distribution_names:
+            if distribution_name in top_level_names:
+                modnames.update(top_level_names[distribution_name])
+            else:
+                # Not installed, best guess
+                modnames.add(distribution_name.replace("-", "_"))
+        return modnames
 
     def visit_import(self, node):
         names = [name for name, _ in node.names]
@@ -143,6 +288,11 @@ class ThirdPartyImportsChecker(BaseChecker):
             return
 
         base_modname = modname.split(".", 1)[0]
+        if base_modname in self.requirements_modules:
+            # Declared 3rd-party package, no need to import it to find out
+            self._check_gated_import(node, modname)
+            return
+
         import_modname = modname
         while True:
             try:
@@ -164,46 +314,148 @@ class ThirdPartyImportsChecker(BaseChecker):
                 break
 
         try:
-            if not is_standard_module(modname) and self._inside_try_except is False:
-                if get_import_package(modname) in self.allowed_3rd_party_modules:
-                    return
-                if self._inside_if or self._inside_funcdef:
-                    message_id = "3rd-party-local-module-not-gated"
-                else:
-                    message_id = "3rd-party-module-not-gated"
-                self.add_message(message_id, node=node, args=modname)
-        except astroid.exceptions.AstroidBuildingException:
-            # Failed to import
-            if self._inside_try_except is False:
-                if get_import_package(modname) in self.allowed_3rd_party_modules:
-                    return
-                if self._inside_if or self._inside_funcdef:
-                    message_id = "3rd-party-local-module-not-gated"
-                else:
-                    message_id = "3rd-party-module-not-gated"
-                self.add_message(message_id, node=node, args=modname)
-        except astroid.exceptions.InferenceError:
-            # Failed to import
-            if self._inside_try_except is False:
-                if get_import_package(modname) in self.allowed_3rd_party_modules:
-                    return
-                if self._inside_if or self._inside_funcdef:
-                    message_id = "3rd-party-local-module-not-gated"
-                else:
-                    message_id = "3rd-party-module-not-gated"
-                self.add_message(message_id, node=node, args=modname)
-        except ImportError:
-            # Definitly not a standard library import
-            if self._inside_try_except is False:
-                if get_import_package(modname) in self.allowed_3rd_party_modules:
-                    return
-                if self._inside_if or self._inside_funcdef:
-                    message_id = "3rd-party-local-module-not-gated"
-                else:
-                    message_id = "3rd-party-module-not-gated"
-                self.add_message(message_id, node=node, args=modname)
+            if is_standard_module(modname):
+                return
+        except (
+            astroid.exceptions.AstroidBuildingException,
+            astroid.exceptions.InferenceError,
+            ImportError,
+        ):
+            # Failed to import, definitely not a standard library import
+            pass
+        self._check_gated_import(node, modname)
+
+    def _check_gated_import(self, node, modname):
+        """Flag the 3rd-party import unless it is gated or explicitly allowed.
+
+        Whether the import is gated or local is only computed here, by walking the
+        import node's ancestors, instead of tracking it on every ``if``, ``try`` and
+        function definition visited.
+        """
+        if get_import_package(modname) in self.allowed_3rd_party_modules:
+            return
+        inside_if_or_funcdef = False
+        for ancestor in node.node_ancestors():
+            if isinstance(ancestor, nodes.Try):
+                return
+            if isinstance(ancestor, (nodes.If, nodes.FunctionDef)):
+                inside_if_or_funcdef = True
+        if inside_if_or_funcdef:
+            message_id = "3rd-party-local-module-not-gated"
+        else:
+            message_id = "3rd-party-module-not-gated"
+        self.add_message(message_id, node=node, args=modname)
+
+
+HEAVY_IMPORTS_MSGS = {
+    "W8420": (
+        "Heavy module %r imported at the top level of a salt loader module%s. "
+        "Consider deferring the import into the functions using it.",
+        "heavy-module-top-level-import",
+        "The salt loader imports every module in a loader directory at startup, even when "
+        "__virtual__ returns False, so heavy top level imports slow down every start.",
+    ),
+}
+
+
+class HeavyImportsChecker(BaseChecker):
+    name = "heavy-imports"
+    msgs = HEAVY_IMPORTS_MSGS
+    priority = -2
+
+    options = (
+        (
+            "heavy-modules",
+            {
+                "default": (
+                    "azure",
+                    "boto3",
+                    "botocore",
+                    "docker",
+                    "google.cloud",
+                    "kubernetes",
+                    "libcloud",
+                    "numpy",
+                    "pandas",
+                    "pyVmomi",
+                ),
+                "type": "csv",
+                "metavar": "<modules>",
+                "help": "Modules which are too heavy to import at the top level of salt loader "
+                "modules, separated by a comma",
+            },
+        ),
+        (
+            "heavy-modules-import-times-file",
+            {
+                "default": "",
+                "type": "string",
+                "metavar": "<path>",
+                "help": "Path to the output of 'python -X importtime', or to a JSON file mapping "
+                "module names to import microseconds. Modules whose cumulative import time is "
+                "above heavy-modules-min-import-time are also considered heavy",
+            },
+        ),
+        (
+            "heavy-modules-min-import-time",
+            {
+                "default": 100,
+                "type": "int",
+                "metavar": "<milliseconds>",
+                "help": "Cumulative import time, in milliseconds, above which a measured module "
+                "is considered heavy",
+            },
+        ),
+    )
+
+    def open(self):
+        super().open()
+        self.known_std_modules = ThirdPartyImportsChecker.get_known_std_modules()
+        self.heavy_modules = set(self.linter.config.heavy_modules)
+        self.import_times = {}
+        import_times_file = self.linter.config.heavy_modules_import_times_file
+        if import_times_file and os.path.isfile(import_times_file):
+            self.import_times = parse_import_times(import_times_file)
+        self.min_import_time = self.linter.config.heavy_modules_min_import_time * 1000
+        self.loader_dirs = get_loader_dirs(self.linter)
+        self.process_module = False
+
+    def visit_module(self, node):
+        self.process_module = is_salt_loader_module(node.file, self.loader_dirs)
+
+    def visit_import(self, node):
+        if not self.process_module or not isinstance(node.scope(), nodes.Module):
+            return
+        for name, _ in node.names:
+            self._check_heavy_import(node, name)
+
+    def visit_importfrom(self, node):
+        if not self.process_module or not isinstance(node.scope(), nodes.Module):
+            return
+        if node.level:
+            # Relative imports are project imports
+            return
+        self._check_heavy_import(node, node.modname)
+
+    def _check_heavy_import(self, node, modname):
+        if get_import_package(modname) in self.known_std_modules:
+            return
+        import_time = self.import_times.get(modname)
+        parts = modname.split(".")
+        for idx in range(len(parts), 0, -1):
+            if ".".join(parts[:idx]) in self.heavy_modules:
+                break
+        else:
+            if import_time is None or import_time < self.min_import_time:
+                return
+        if import_time is None:
+            cost = ""
+        else:
+            cost = f", it takes {import_time / 1000:.1f}ms to import"
+        self.add_message("heavy-module-top-level-import", node=node, args=(modname, cost))
 
 
 def register(linter):
     """Required method to auto register this checker."""
     linter.register_checker(ThirdPartyImportsChecker(linter))
+    linter.register_checker(HeavyImportsChecker(linter))
@@ -0,0 +1,214 @@
+"""
+saltpylint.timebudget
+~~~~~~~~~~~~~~~~~~~~~
+
+Enforces per checker time budgets, per file and cumulative per run, on the saltpylint
+checkers. When a checker exceeds its budget it is skipped for the rest of that file,
+or run, and an informational message names the checker and the file. The time of
+checkers which ``saltpylint.pathscope`` deactivated for a file is not accounted. The
+``leave_*`` callbacks of the nodes a skipped checker already visited still run, untimed,
+so checkers keeping state across their ``visit_*`` and ``leave_*`` callbacks stay
+consistent.
+
+Budgets are disabled by default, so CI keeps full checking. Local, pre-commit, runs
+can bound their latency with, for example:
+
+.. code-block:: ini
+
+    [MASTER]
+    load-plugins=saltpylint
+
+    [TIME-BUDGET]
+    checker-time-budget-per-file=2
+    checker-time-budget-per-run=60
+"""
+
+import time
+from typing import ClassVar
+
+from pylint.checkers import BaseChecker
+
+from saltpylint.pathscope import PathScopeChecker
+
+TIME_BUDGET_MSG = "checker-time-budget-exceeded"
+
+
+class _BudgetedCallback:
+    """Wraps a checker ``visit_*``/``leave_*`` callback in order to account its time."""
+
+    def __init__(self, budget_checker, checker, callback, paired=None):
+        self.budget_checker = budget_checker
+        self.checker_name = checker.name
+        self.callback = callback
+        # "visit" or "leave" when the checker also has the matching "leave_"/"visit_" callback
+        self.paired = paired
+        if hasattr(callback, "checks_msgs"):
+            # Preserve pylint's ``only_required_for_messages`` information
+            self.checks_msgs = callback.checks_msgs
+
+    def __call__(self, node):
+        return self.budget_checker.run_callback(
+            self.checker_name,
+            self.callback,
+            node,
+            paired=self.paired,
+        )
+
+
+class TimeBudgetChecker(BaseChecker):
+    """Skips checkers which exceed their time budget."""
+
+    name = "time-budget"
+    priority = -1
+
+    msgs: ClassVar = {
+        "I9801": (
+            "Checker %r exceeded its %s time budget of %ss while checking %r. "
+            "Skipping it for the rest of the %s.",
+            TIME_BUDGET_MSG,
+            "A checker exceeded its time budget and was skipped.",
+        ),
+    }
+
+    options = (
+        (
+            "checker-time-budget-per-file",
+            {
+                "default": 0,
+                "type": "float",
+                "metavar": "<seconds>",
+                "help": "Maximum time, in seconds, a checker may spend on a single file. "
+                "0 disables the budget",
+            },
+        ),
+        (
+            "checker-time-budget-per-run",
+            {
+                "default": 0,
+                "type": "float",
+                "metavar": "<seconds>",
+                "help": "Maximum cumulative time, in seconds, a checker may spend in a run. "
+                "0 disables the budget",
+            },
+        ),
+        (
+            "time-budgeted-checkers",
+            {
+                "default": (),
+                "type": "csv",
+                "metavar": "<checker-names>",
+                "help": "Names of the checkers subject to the time budgets, separated by a comma. "
+                "Defaults to all saltpylint checkers",
+            },
+        ),
+    )
+
+    def __init__(self, linter=None) -> None:
+        BaseChecker.__init__(self, linter)
+        self.path_scope = None
+        self._reset()
+
+    def _reset(self):
+        self.current_file = None
+        self.file_elapsed = {}
+        self.run_elapsed = {}
+        self.skipped_for_file = set()
+        self.skipped_for_run = set()
+        # (checker_name, node) pairs whose paired visit_* ran and whose leave_* didn't yet
+        self.entered = set()
+
+    def open(self):
+        super().open()
+        self._reset()
+
+    def install(self):
+        """Wrap the callbacks of the budgeted checkers."""
+        config = self.linter.config
+        if not config.checker_time_budget_per_file and not config.checker_time_budget_per_run:
+            # Budgets disabled, don't add any overhead
+            return
+        budgeted_checkers = set(config.time_budgeted_checkers)
+        for checker in self.linter.get_checkers():
+            if isinstance(checker, PathScopeChecker):
+                self.path_scope = checker
+            if checker is self or checker is self.linter:
+                continue
+            if budgeted_checkers:
+                if checker.name not in budgeted_checkers:
+                    continue
+            elif not type(checker).__module__.startswith("saltpylint."):
+                continue
+            members = set(dir(checker))
+            for member in members:
+                if not member.startswith(("visit_", "leave_")):
+                    continue
+                callback = getattr(checker, member)
+                if not callable(callback) or isinstance(callback, _BudgetedCallback):
+                    continue
+                prefix, node_type = member.split("_", 1)
+                counterpart = f"{'leave' if prefix == 'visit' else 'visit'}_{node_type}"
+                paired = prefix if counterpart in members else None
+                setattr(checker, member, _BudgetedCallback(self, checker, callback, paired))
+
+    def run_callback(self, checker_name, callback, node, paired=None):
+        current_file = self.linter.current_file
+        if current_file != self.current_file:
+            self.current_file = current_file
+            self.file_elapsed = {}
+            self.skipped_for_file = set()
+            self.entered = set()
+        if checker_name in self.skipped_for_run or checker_name in self.skipped_for_file:
+            if paired == "leave" and (checker_name, node) in self.entered:
+                # Unwind the state the checker built before being skipped
+                self.entered.discard((checker_name, node))
+                return callback(node)
+            return None
+        if self.path_scope is not None and checker_name in self.path_scope.get_inactive_checkers():
+            # A no-op for this file, don't charge it to the checker
+            return None
+        if paired == "visit":
+            self.entered.add((checker_name, node))
+        elif paired == "leave":
+            self.entered.discard((checker_name, node))
+        start = time.perf_counter()
+        try:
+            return callback(node)
+        finally:
+            self._account(checker_name, time.perf_counter() - start, node)
+
+    def _account(self, checker_name, elapsed, node):
+        config = self.linter.config
+        file_elapsed = self.file_elapsed.get(checker_name, 0) + elapsed
+        self.file_elapsed[checker_name] = file_elapsed
+        run_elapsed = self.run_elapsed.get(checker_name, 0) + elapsed
+        self.run_elapsed[checker_name] = run_elapsed
+
+        budget = config.checker_time_budget_per_run
+        if budget and run_elapsed > budget:
+            self.skipped_for_run.add(checker_name)
+            self.add_message(
+                TIME_BUDGET_MSG,
+                node=node,
+                args=(checker_name, "per run", budget, self.current_file, "run"),
+            )
+            return
+        budget = config.checker_time_budget_per_file
+        if budget and file_elapsed > budget:
+            self.skipped_for_file.add(checker_name)
+            self.add_message(
+                TIME_BUDGET_MSG,
+                node=node,
+                args=(checker_name, "per file", budget, self.current_file, "file"),
+            )
+
+
+def register(linter):
+    """Required method to auto register this checker."""
+    linter.register_checker(TimeBudgetChecker(linter))
+
+
+def load_configuration(linter):
+    """Wrap the budgeted checkers once all plugins are loaded and configured."""
+    for checker in linter.get_checkers():
+        if isinstance(checker, TimeBudgetChecker):
+            checker.install()
@@ -0,0 +1,140 @@
+"""
+saltpylint.utils
+~~~~~~~~~~~~~~~~
+
+Helpers shared by the saltpylint checkers.
+"""
+
+import fnmatch
+import re
+
+import astroid
+
+from saltpylint.inference import safe_infer
+
+SALT_DUNDERS = (
+    "__opts__",
+    "__salt__",
+    "__runner__",
+    "__context__",
+    "__utils__",
+    "__ext_pillar__",
+    "__thorium__",
+    "__states__",
+    "__serializers__",
+    "__ret__",
+    "__grains__",
+    "__pillar__",
+    "__sdb__",
+    "__proxy__",
+    "__low__",
+    "__orchestration_jid__",
+    "__running__",
+    "__intance_id__",
+    "__lowstate__",
+    "__env__",
+)
+
+
+def compile_globs(globs):
+    """Compile the passed globs into a single regular expression.
+
+    Only ``*`` and ``?`` are special, brackets are matched literally so that salt loader
+    dunder calls can be written as ``__salt__[cmd.*]``. Returns ``None`` when there are no
+    globs, so callers can skip matching altogether.
+    """
+    globs = [glob for glob in globs if glob]
+    if not globs:
+        return None
+    return re.compile("|".join(fnmatch.translate(glob.replace("[", "[[]")) for glob in globs))
+
+
+def _resolve_name(node):
+    """Resolve a name to the dotted name of what it was imported as, if imported."""
+    name = node.name
+    try:
+        scope, assignments = node.lookup(name)
+    except Exception:  # pylint: disable=broad-except
+        return name
+    if scope.root() is not node.root():
+        # A builtin, like ``open``, which astroid resolves to its implementation
+        return name
+    for assignment in assignments:
+        if isinstance(assignment, astroid.Import):
+            for modname, alias in assignment.names:
+                if alias == name:
+                    return modname
+                if alias is None and modname.split(".", 1)[0] == name:
+                    return name
+        elif isinstance(assignment, astroid.ImportFrom):
+            for imported_name, alias in assignment.names:
+                if (alias or imported_name) == name:
+                    return f"{assignment.modname}.{imported_name}"
+    return name
+
+
+def get_dotted_name(node):
+    """Return the dotted name of a ``Name`` or ``Attribute`` node, resolving imports.
+
+    No inference is involved, ``None`` is returned if the node is something else.
+    """
+    if isinstance(node, astroid.Name):
+        return _resolve_name(node)
+    if isinstance(node, astroid.Attribute):
+        expr = get_dotted_name(node.expr)
+        if expr is None:
+            return None
+        return f"{expr}.{node.attrname}"
+    return None
+
+
+def get_call_target_name(node):
+    """Return the name of what the passed call node calls.
+
+    Calls to salt loader dunders, like ``__salt__["cmd.run"](...)``, are returned as
+    ``__salt__[cmd.run]``. Other calls are returned as their import resolved dotted name,
+    like ``subprocess.Popen``. ``None`` is returned if the target can't be named.
+    """
+    func = node.func
+    if isinstance(func, astroid.Subscript):
+        if (
+            isinstance(func.value, astroid.Name)
+            and func.value.name in SALT_DUNDERS
+            and isinstance(func.slice, astroid.Const)
+            and isinstance(func.slice.value, str)
+        ):
+            return f"{func.value.name}[{func.slice.value}]"
+        return None
+    return get_dotted_name(func)
+
+
+def get_inferred_full_name(node, max_depth=20):
+    """Return the full dotted name of what the passed call node calls, using inference.
+
+    For example, ``os.walk`` for ``walk()`` after ``from os import walk``. ``None`` is
+    returned if the called function can't be inferred.
+    """
+    try:
+        func = safe_infer(node.func)
+        if func.name.__str__() == "Uninferable":
+            return None
+    except Exception:  # pylint: disable=broad-except
+        func = None
+    if func is None:
+        return None
+    ret = []
+    depth = 0
+    while func is not None:
+        depth += 1
+        if depth > max_depth:
+            # Prevent endless loop
+            return None
+        try:
+            ret.append(func.name)
+        except AttributeError:
+            return None
+        func = func.parent
+    # ret will contain the levels of the function from last to first (e.g.
+    # ['walk', 'os']. Reverse it and join with dots to get the correct
+    # full name for the function.
+    return ".".join(ret[::-1])
@@ -3,7 +3,12 @@ from typing import ClassVar
 import astroid
 from pylint.checkers import BaseChecker
 
+from saltpylint.inference import infer
+from saltpylint.utils import compile_globs
+from saltpylint.utils import get_call_target_name
+
 VIRT_LOG = "log-in-virtual"
+VIRT_EXPENSIVE_CALL = "expensive-call-in-virtual"
 
 
 class VirtChecker(BaseChecker):
@@ -17,11 +22,48 @@ class VirtChecker(BaseChecker):
             VIRT_LOG,
             "Loader processes __virtual__ so logging not in scope",
         ),
+        "W1490": (
+            "Expensive call to %r detected inside __virtual__. "
+            "Defer it to the functions needing it.",
+            VIRT_EXPENSIVE_CALL,
+            "The loader calls __virtual__ for every module at startup, so expensive work "
+            "in it slows down every start.",
+        ),
     }
-    options = ()
+    options = (
+        (
+            "virtual-expensive-calls",
+            {
+                "default": (
+                    "__salt__[cmd.*]",
+                    "__salt__[pkg.*]",
+                    "__salt__[service.*]",
+                    "open",
+                    "os.popen",
+                    "os.system",
+                    "requests.*",
+                    "salt.utils.files.fopen",
+                    "salt.utils.http.query",
+                    "salt.utils.path.which",
+                    "salt.utils.path.which_bin",
+                    "socket.*",
+                    "subprocess.*",
+                    "urllib.request.urlopen",
+                ),
+                "type": "csv",
+                "metavar": "<call-globs>",
+                "help": "Globs of the call targets considered expensive inside __virtual__, "
+                "separated by a comma. Salt loader dunder calls are written as __salt__[cmd.run]",
+            },
+        ),
+    )
 
     priority = -1
 
+    def open(self):
+        super().open()
+        self.expensive_calls = compile_globs(self.linter.config.virtual_expensive_calls)
+
     def visit_functiondef(self, node):
         """Verifies no logger statements inside __virtual__."""
         if (
@@ -40,6 +82,8 @@ class VirtChecker(BaseChecker):
         except AttributeError:
             return
 
+        self._check_expensive_calls(node)
+
         # walk contents of __virtual__ function
         for child in node.get_children():
             for functions in child.get_children():
@@ -49,7 +93,7 @@ class VirtChecker(BaseChecker):
                 ):
                     try:
                         # Inspect each statement for an instance of 'logging'
-                        for inferred in functions.func.expr.infer():
+                        for inferred in infer(functions.func.expr):
                             try:
                                 instance_type = inferred.pytype().split(".")[0]
                             except TypeError:
@@ -62,6 +106,18 @@ class VirtChecker(BaseChecker):
                         # Not a log function
                         return
 
+    def _check_expensive_calls(self, node):
+        """Flag the expensive calls anywhere in the __virtual__ body, including nested blocks."""
+        if self.expensive_calls is None:
+            return
+        for call in node.nodes_of_class(
+            astroid.Call,
+            skip_klass=(astroid.FunctionDef, astroid.ClassDef, astroid.Lambda),
+        ):
+            target = get_call_target_name(call)
+            if target is not None and self.expensive_calls.match(target):
+                self.add_message(VIRT_EXPENSIVE_CALL, node=call, args=(target,))
+
 
 def register(linter):
     """Required method to auto register this checker."""